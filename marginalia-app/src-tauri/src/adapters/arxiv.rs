@@ -3,7 +3,10 @@
 //! Provides open access PDF lookup via arXiv's OAI-PMH API.
 //! See: https://arxiv.org/help/api/
 
-use crate::utils::http::{rate_limiters, with_retry, RetryConfig};
+use crate::utils::http::{
+    circuit_breakers, is_transient_error, rate_limiters, status_error, with_retry, RetryConfig,
+};
+use once_cell::sync::Lazy;
 use regex::Regex;
 use reqwest::Client;
 use std::time::Duration;
@@ -12,6 +15,19 @@ use tracing::{debug, warn};
 /// Default timeout for arXiv API requests
 const DEFAULT_TIMEOUT_SECS: u64 = 30;
 
+/// New-style arXiv ID: YYMM.NNNNN (e.g., 2301.12345)
+static NEW_ID_PATTERN: Lazy<Regex> =
+    Lazy::new(|| Regex::new(r"(\d{4}\.\d{4,5}(?:v\d+)?)").expect("valid arXiv ID regex"));
+
+/// Old-style arXiv ID: category/YYMMNNN (e.g., hep-th/9901001)
+static OLD_ID_PATTERN: Lazy<Regex> =
+    Lazy::new(|| Regex::new(r"([a-z-]+/\d{7}(?:v\d+)?)").expect("valid arXiv ID regex"));
+
+/// Abstract-page ID in an Atom search response
+static ATOM_ID_PATTERN: Lazy<Regex> = Lazy::new(|| {
+    Regex::new(r"<id>https?://arxiv\.org/abs/([^<]+)</id>").expect("valid arXiv Atom ID regex")
+});
+
 /// Client for the arXiv API
 pub struct ArxivClient {
     client: Client,
@@ -42,19 +58,13 @@ impl ArxivClient {
     /// - https://arxiv.org/pdf/2301.12345.pdf
     /// - 10.48550/arXiv.2301.12345 (DOI format)
     pub fn extract_arxiv_id(input: &str) -> Option<String> {
-        // Pattern for arXiv IDs (both old and new format)
-        // New format: YYMM.NNNNN (e.g., 2301.12345)
-        // Old format: category/YYMMNNN (e.g., hep-th/9901001)
-        let new_pattern = Regex::new(r"(\d{4}\.\d{4,5}(?:v\d+)?)").ok()?;
-        let old_pattern = Regex::new(r"([a-z-]+/\d{7}(?:v\d+)?)").ok()?;
-
         // Try new format first
-        if let Some(cap) = new_pattern.captures(input) {
+        if let Some(cap) = NEW_ID_PATTERN.captures(input) {
             return Some(cap[1].to_string());
         }
 
         // Try old format
-        if let Some(cap) = old_pattern.captures(input) {
+        if let Some(cap) = OLD_ID_PATTERN.captures(input) {
             return Some(cap[1].to_string());
         }
 
@@ -67,9 +77,16 @@ impl ArxivClient {
     /// * `arxiv_id` - The arXiv ID (e.g., "2301.12345" or "hep-th/9901001")
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL
-    /// * `None` - If the paper is not found
-    pub async fn find_pdf_by_id(&self, arxiv_id: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL
+    /// * `Ok(None)` - If the paper is not on arXiv
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_id(&self, arxiv_id: &str) -> Result<Option<String>, String> {
+        if !circuit_breakers::ARXIV.allow_request() {
+            debug!("Skipping arXiv request: circuit open");
+            return Err("arXiv circuit open".to_string());
+        }
+
         // Wait for rate limit slot (arXiv asks for 3-second delay between requests)
         rate_limiters::ARXIV.wait_for_slot("arxiv").await;
 
@@ -109,7 +126,7 @@ impl ArxivClient {
                         .map_err(|e| format!("request failed: {}", e))?;
 
                     if !resp.status().is_success() {
-                        return Err(format!("status: {}", resp.status()));
+                        return Err(status_error("status", &resp));
                     }
 
                     resp.text()
@@ -117,19 +134,16 @@ impl ArxivClient {
                         .map_err(|e| format!("read failed: {}", e))
                 }
             },
-            |err| {
-                err.contains("request failed")
-                    || err.contains("status: 5")
-                    || err.contains("status: 429")
-            },
+            |err| is_transient_error(err),
         )
         .await;
+        circuit_breakers::ARXIV.record(&result);
 
         let xml_response = match result {
             Ok(r) => r,
             Err(e) => {
                 warn!("arXiv API request failed: {}", e);
-                return None;
+                return Err(e);
             }
         };
 
@@ -137,14 +151,14 @@ impl ArxivClient {
         // The API returns XML with <entry> tags for found papers
         if !xml_response.contains("<entry>") {
             debug!("Paper not found on arXiv: {}", clean_id);
-            return None;
+            return Ok(None);
         }
 
         // arXiv PDF URLs are predictable: https://arxiv.org/pdf/{id}.pdf
         let pdf_url = format!("https://arxiv.org/pdf/{}.pdf", clean_id);
         debug!("Found arXiv PDF: {}", pdf_url);
 
-        Some(pdf_url)
+        Ok(Some(pdf_url))
     }
 
     /// Try to find a PDF by DOI (checks if DOI is an arXiv DOI)
@@ -153,19 +167,21 @@ impl ArxivClient {
     /// * `doi` - The DOI to check
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if DOI is an arXiv paper
-    /// * `None` - If DOI is not an arXiv paper
-    pub async fn find_pdf_by_doi(&self, doi: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if DOI is an arXiv paper
+    /// * `Ok(None)` - If DOI is not an arXiv paper
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_doi(&self, doi: &str) -> Result<Option<String>, String> {
         // arXiv DOIs have format: 10.48550/arXiv.XXXX.XXXXX
         if !doi.starts_with("10.48550/arXiv.") && !doi.contains("arXiv") {
-            return None;
+            return Ok(None);
         }
 
         if let Some(arxiv_id) = Self::extract_arxiv_id(doi) {
             return self.find_pdf_by_id(&arxiv_id).await;
         }
 
-        None
+        Ok(None)
     }
 
     /// Search for a paper by title on arXiv
@@ -174,9 +190,16 @@ impl ArxivClient {
     /// * `title` - The paper title to search for
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if a matching paper is found
-    /// * `None` - If no matching paper is found
-    pub async fn find_pdf_by_title(&self, title: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if a matching paper is found
+    /// * `Ok(None)` - If no matching paper is found
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_title(&self, title: &str) -> Result<Option<String>, String> {
+        if !circuit_breakers::ARXIV.allow_request() {
+            debug!("Skipping arXiv request: circuit open");
+            return Err("arXiv circuit open".to_string());
+        }
+
         // Wait for rate limit slot
         rate_limiters::ARXIV.wait_for_slot("arxiv").await;
 
@@ -213,7 +236,7 @@ impl ArxivClient {
                         .map_err(|e| format!("request failed: {}", e))?;
 
                     if !resp.status().is_success() {
-                        return Err(format!("status: {}", resp.status()));
+                        return Err(status_error("status", &resp));
                     }
 
                     resp.text()
@@ -221,35 +244,30 @@ impl ArxivClient {
                         .map_err(|e| format!("read failed: {}", e))
                 }
             },
-            |err| {
-                err.contains("request failed")
-                    || err.contains("status: 5")
-                    || err.contains("status: 429")
-            },
+            |err| is_transient_error(err),
         )
         .await;
+        circuit_breakers::ARXIV.record(&result);
 
         let xml_response = match result {
             Ok(r) => r,
             Err(e) => {
                 warn!("arXiv title search failed: {}", e);
-                return None;
+                return Err(e);
             }
         };
 
         // Extract arXiv ID from the response
         // Look for <id>http://arxiv.org/abs/XXXX.XXXXX</id>
-        let id_pattern = Regex::new(r"<id>https?://arxiv\.org/abs/([^<]+)</id>").ok()?;
-
-        if let Some(cap) = id_pattern.captures(&xml_response) {
+        if let Some(cap) = ATOM_ID_PATTERN.captures(&xml_response) {
             let arxiv_id = &cap[1];
             let pdf_url = format!("https://arxiv.org/pdf/{}.pdf", arxiv_id);
             debug!("Found arXiv PDF via title search: {}", pdf_url);
-            return Some(pdf_url);
+            return Ok(Some(pdf_url));
         }
 
         debug!("No arXiv paper found for title: {}", title);
-        None
+        Ok(None)
     }
 }
 
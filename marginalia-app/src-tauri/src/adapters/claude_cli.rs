@@ -5,8 +5,16 @@
 //! - Paper summarization with structured output
 
 use crate::models::{Paper, RelatedPaper};
+use crate::utils::claude::{claude_program, get_claude_version, is_claude_available};
 use std::process::Command;
-use tracing::{debug, info, warn};
+use std::time::Duration;
+use tracing::{debug, info};
+
+/// Longest a Claude CLI PDF search may take before it is killed
+const PDF_SEARCH_TIMEOUT: Duration = Duration::from_secs(180);
+
+/// Longest a Claude CLI summary may take before it is killed
+const SUMMARY_TIMEOUT: Duration = Duration::from_secs(300);
 
 /// Claude CLI client for LLM-powered operations
 pub struct ClaudeCliClient;
@@ -19,26 +27,17 @@ impl ClaudeCliClient {
 
     /// Check if Claude CLI is installed and available
     pub fn is_available() -> bool {
-        Command::new("claude")
-            .arg("--version")
-            .output()
-            .map(|o| o.status.success())
-            .unwrap_or(false)
+        is_claude_available()
     }
 
     /// Get Claude CLI version
     pub fn get_version() -> Option<String> {
-        Command::new("claude")
-            .arg("--version")
-            .output()
-            .ok()
-            .filter(|o| o.status.success())
-            .map(|o| String::from_utf8_lossy(&o.stdout).trim().to_string())
+        get_claude_version()
     }
 
     /// Check if user is logged in by testing a simple command
     pub fn is_logged_in() -> bool {
-        Command::new("claude")
+        Command::new(claude_program())
             .args(["--print", "-p", "Say hi"])
             .output()
             .map(|o| o.status.success())
@@ -51,12 +50,13 @@ impl ClaudeCliClient {
     /// * `paper` - Paper to search for
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if found
-    /// * `None` - If no PDF found or Claude is unavailable
-    pub async fn find_pdf_url(&self, paper: &Paper) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If Claude searched and replied that there is none
+    /// * `Err(error)` - If the CLI is unavailable, failed, timed out, or gave
+    ///   an unusable reply, so the answer is unknown
+    pub async fn find_pdf_url(&self, paper: &Paper) -> Result<Option<String>, String> {
         if !Self::is_available() {
-            warn!("Claude CLI not available for PDF search");
-            return None;
+            return Err("Claude CLI not available for PDF search".to_string());
         }
 
         let prompt = format!(
@@ -71,31 +71,46 @@ impl ClaudeCliClient {
 
         debug!("Claude PDF search for: {}", paper.title);
 
-        let output = match Command::new("claude")
+        // Async spawn: the search can take tens of seconds and must not block a runtime worker.
+        // On timeout the output future is dropped, which kills the child.
+        let run = tokio::process::Command::new(claude_program())
             .args(["--print", "-p", &prompt])
-            .output()
-        {
-            Ok(o) => o,
-            Err(e) => {
-                warn!("Failed to run Claude CLI: {}", e);
-                return None;
+            .kill_on_drop(true)
+            .output();
+        let output = match tokio::time::timeout(PDF_SEARCH_TIMEOUT, run).await {
+            Ok(Ok(o)) => o,
+            Ok(Err(e)) => return Err(format!("Failed to run Claude CLI: {}", e)),
+            Err(_) => {
+                return Err(format!("Claude CLI PDF search timed out after {:?}", PDF_SEARCH_TIMEOUT));
             }
         };
 
         if !output.status.success() {
             let stderr = String::from_utf8_lossy(&output.stderr);
-            warn!("Claude CLI error: {}", stderr);
-            return None;
+            return Err(format!("Claude CLI error: {}", stderr));
         }
 
-        let response = String::from_utf8_lossy(&output.stdout).trim().to_string();
+        let response = String::from_utf8_lossy(&output.stdout);
+        let url = Self::parse_pdf_url_reply(&response)?;
+        match &url {
+            Some(url) => info!("Claude found PDF URL: {}", url),
+            None => debug!("Claude did not find PDF URL"),
+        }
+        Ok(url)
+    }
 
+    /// Parse the reply to the PDF search prompt
+    ///
+    /// Only a PDF URL or the literal `NONE` the prompt asks for are answers;
+    /// anything else (e.g. a chatty explanation) is an error.
+    fn parse_pdf_url_reply(response: &str) -> Result<Option<String>, String> {
+        let response = response.trim();
         if response.starts_with("http") && response.contains(".pdf") {
-            info!("Claude found PDF URL: {}", response);
-            Some(response)
+            Ok(Some(response.to_string()))
+        } else if response.trim_matches(&['\'', '.'][..]).eq_ignore_ascii_case("none") {
+            Ok(None)
         } else {
-            debug!("Claude did not find PDF URL");
-            None
+            Err(format!("Unexpected Claude CLI reply: {}", response))
         }
     }
 
@@ -121,10 +136,18 @@ impl ClaudeCliClient {
 
         info!("Summarizing paper: {}", paper.title);
 
-        let output = Command::new("claude")
+        // On timeout the output future is dropped, which kills the child
+        let run = tokio::process::Command::new(claude_program())
             .args(["--print", "-p", &prompt])
-            .output()
-            .map_err(|e| format!("Failed to run Claude CLI: {}", e))?;
+            .kill_on_drop(true)
+            .output();
+        let output = match tokio::time::timeout(SUMMARY_TIMEOUT, run).await {
+            Ok(Ok(o)) => o,
+            Ok(Err(e)) => return Err(format!("Failed to run Claude CLI: {}", e)),
+            Err(_) => {
+                return Err(format!("Claude CLI timed out after {}s", SUMMARY_TIMEOUT.as_secs()));
+            }
+        };
 
         if !output.status.success() {
             let stderr = String::from_utf8_lossy(&output.stderr);
@@ -285,4 +308,16 @@ End of paper.
         assert_eq!(related[0].year, Some(2020));
         assert_eq!(related[1].title, "Paper Two");
     }
+
+    #[test]
+    fn test_parse_pdf_url_reply() {
+        assert_eq!(
+            ClaudeCliClient::parse_pdf_url_reply(" https://example.org/paper.pdf\n").unwrap(),
+            Some("https://example.org/paper.pdf".to_string())
+        );
+        assert_eq!(ClaudeCliClient::parse_pdf_url_reply("NONE\n").unwrap(), None);
+        assert_eq!(ClaudeCliClient::parse_pdf_url_reply("'None'.").unwrap(), None);
+        assert!(ClaudeCliClient::parse_pdf_url_reply("I couldn't access the web.").is_err());
+        assert!(ClaudeCliClient::parse_pdf_url_reply("").is_err());
+    }
 }
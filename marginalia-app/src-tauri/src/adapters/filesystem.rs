@@ -3,16 +3,60 @@
 //! Handles file operations for PDFs, summaries, and other vault files.
 
 use crate::models::Paper;
-use crate::utils::http::{is_likely_login_page, is_valid_pdf, with_retry, RetryConfig};
+use crate::utils::http::{is_likely_login_page, is_valid_pdf, status_error, with_retry, RetryConfig};
+use crate::utils::text::join_nonblank_lines;
 use reqwest::Client;
-use std::fs;
-use std::path::PathBuf;
+use serde::{Deserialize, Serialize};
+use std::path::{Path, PathBuf};
 use std::time::Duration;
+use tokio::io::AsyncWriteExt;
 use tracing::{debug, info, warn};
+use uuid::Uuid;
 
 /// Default timeout for PDF downloads
 const DOWNLOAD_TIMEOUT_SECS: u64 = 60;
 
+/// Bytes read from the start of a download to validate it before writing
+const SNIFF_BYTES: usize = 1024;
+
+/// File in a paper's directory holding the last parsed Claude summary response
+const RESPONSE_CACHE_FILE: &str = "summary_response.json";
+
+/// File next to a paper's PDF caching its cleaned, extracted text
+const TEXT_CACHE_FILE: &str = "full_text.txt";
+
+/// Cached Claude response, tagged with the prompt it answered
+#[derive(Serialize, Deserialize)]
+struct CachedResponse {
+    prompt_hash: String,
+    response: String,
+}
+
+/// Sibling temp path for writing `path`, unique to this call
+///
+/// Concurrent writers of the same file each get their own temp file, so one
+/// can't truncate or interleave with the bytes of another before the rename.
+fn unique_tmp_path(path: &Path) -> PathBuf {
+    let mut tmp_path = path.as_os_str().to_owned();
+    tmp_path.push(format!(".{}.tmp", Uuid::new_v4().simple()));
+    PathBuf::from(tmp_path)
+}
+
+/// Write a file by writing a sibling temp file and renaming it into place
+///
+/// The rename is atomic on the same filesystem, so readers (and a crash
+/// mid-write) see either the old contents or the new ones, never a truncated
+/// file.
+pub async fn write_atomic(path: &Path, contents: impl AsRef<[u8]>) -> std::io::Result<()> {
+    let tmp_path = unique_tmp_path(path);
+
+    if let Err(e) = tokio::fs::write(&tmp_path, contents).await {
+        let _ = tokio::fs::remove_file(&tmp_path).await;
+        return Err(e);
+    }
+    tokio::fs::rename(&tmp_path, path).await
+}
+
 /// Adapter for filesystem operations
 #[derive(Clone)]
 pub struct FileSystemAdapter {
@@ -63,23 +107,25 @@ impl FileSystemAdapter {
         let client = self.client.clone();
         let url_owned = url.to_string();
 
-        // Use retry logic for the download
-        let bytes = with_retry(
+        // Use retry logic for the request; the body is validated from its
+        // first bytes and then streamed to disk rather than buffered
+        let (mut resp, head) = with_retry(
             &retry_config,
             &format!("PDF download from {}", url),
             || {
                 let client = client.clone();
                 let url = url_owned.clone();
                 async move {
-                    let resp = client
+                    let mut resp = client
                         .get(&url)
                         .header("User-Agent", "Marginalia/1.0 (academic literature manager)")
+                        .timeout(Duration::from_secs(DOWNLOAD_TIMEOUT_SECS))
                         .send()
                         .await
                         .map_err(|e| format!("HTTP request failed: {}", e))?;
 
                     if !resp.status().is_success() {
-                        return Err(format!("HTTP status: {}", resp.status()));
+                        return Err(status_error("HTTP status", &resp));
                     }
 
                     // Get content type for validation
@@ -89,22 +135,30 @@ impl FileSystemAdapter {
                         .and_then(|v| v.to_str().ok())
                         .map(|s| s.to_string());
 
-                    let bytes = resp
-                        .bytes()
-                        .await
-                        .map_err(|e| format!("Failed to read response: {}", e))?;
+                    // Read just enough of the body to validate it
+                    let mut head = Vec::with_capacity(SNIFF_BYTES);
+                    while head.len() < SNIFF_BYTES {
+                        match resp
+                            .chunk()
+                            .await
+                            .map_err(|e| format!("Failed to read response: {}", e))?
+                        {
+                            Some(chunk) => head.extend_from_slice(&chunk),
+                            None => break,
+                        }
+                    }
 
                     // Check for login page redirect (publisher paywall)
-                    if is_likely_login_page(content_type.as_deref(), &bytes) {
+                    if is_likely_login_page(content_type.as_deref(), &head) {
                         return Err("Response appears to be a login/paywall page".to_string());
                     }
 
                     // Validate PDF magic bytes
-                    if !is_valid_pdf(&bytes) {
+                    if !is_valid_pdf(&head) {
                         return Err("Response is not a valid PDF (invalid magic bytes)".to_string());
                     }
 
-                    Ok(bytes)
+                    Ok((resp, head))
                 }
             },
             |err| {
@@ -118,11 +172,24 @@ impl FileSystemAdapter {
 
         // Create paper directory
         let paper_dir = PathBuf::from(vault_path).join("papers").join(citekey);
-        fs::create_dir_all(&paper_dir)
+        tokio::fs::create_dir_all(&paper_dir)
+            .await
             .map_err(|e| format!("Failed to create directory: {}", e))?;
 
+        // Stream into a temporary file and rename it into place, so an
+        // interrupted download never leaves a truncated paper.pdf behind.
+        // The temp name is unique so overlapping downloads of the same paper
+        // don't write into each other's file.
         let pdf_path = paper_dir.join("paper.pdf");
-        fs::write(&pdf_path, &bytes).map_err(|e| format!("Failed to write PDF: {}", e))?;
+        let part_path = unique_tmp_path(&pdf_path);
+        if let Err(e) = Self::stream_to_file(&part_path, &head, &mut resp).await {
+            let _ = tokio::fs::remove_file(&part_path).await;
+            return Err(e);
+        }
+        if let Err(e) = tokio::fs::rename(&part_path, &pdf_path).await {
+            let _ = tokio::fs::remove_file(&part_path).await;
+            return Err(format!("Failed to write PDF: {}", e));
+        }
 
         let relative_path = format!("papers/{}/paper.pdf", citekey);
         info!("Downloaded PDF to {}", relative_path);
@@ -130,6 +197,35 @@ impl FileSystemAdapter {
         Ok(relative_path)
     }
 
+    /// Write already-read bytes followed by the rest of a response body to a file
+    async fn stream_to_file(
+        path: &Path,
+        head: &[u8],
+        resp: &mut reqwest::Response,
+    ) -> Result<(), String> {
+        let mut file = tokio::fs::File::create(path)
+            .await
+            .map_err(|e| format!("Failed to write PDF: {}", e))?;
+
+        file.write_all(head)
+            .await
+            .map_err(|e| format!("Failed to write PDF: {}", e))?;
+
+        while let Some(chunk) = resp
+            .chunk()
+            .await
+            .map_err(|e| format!("Failed to read response: {}", e))?
+        {
+            file.write_all(&chunk)
+                .await
+                .map_err(|e| format!("Failed to write PDF: {}", e))?;
+        }
+
+        file.flush()
+            .await
+            .map_err(|e| format!("Failed to write PDF: {}", e))
+    }
+
     /// Save a summary file for a paper
     ///
     /// # Arguments
@@ -140,20 +236,22 @@ impl FileSystemAdapter {
     /// # Returns
     /// * `Ok(relative_path)` - Relative path to the saved summary
     /// * `Err(error)` - If save fails
-    pub fn save_summary(
+    pub async fn save_summary(
         &self,
         vault_path: &str,
         paper: &Paper,
         summary_content: &str,
     ) -> Result<String, String> {
         let paper_dir = PathBuf::from(vault_path).join("papers").join(&paper.citekey);
-        fs::create_dir_all(&paper_dir)
+        tokio::fs::create_dir_all(&paper_dir)
+            .await
             .map_err(|e| format!("Failed to create directory: {}", e))?;
 
         let formatted = Self::format_summary_with_frontmatter(paper, summary_content);
 
         let summary_path = paper_dir.join("summary.md");
-        fs::write(&summary_path, &formatted)
+        write_atomic(&summary_path, &formatted)
+            .await
             .map_err(|e| format!("Failed to write summary: {}", e))?;
 
         let relative_path = format!("papers/{}/summary.md", paper.citekey);
@@ -172,18 +270,20 @@ impl FileSystemAdapter {
     /// # Returns
     /// * `Ok(relative_path)` - Relative path to the saved file
     /// * `Err(error)` - If save fails
-    pub fn save_raw_response(
+    pub async fn save_raw_response(
         &self,
         vault_path: &str,
         citekey: &str,
         raw_content: &str,
     ) -> Result<String, String> {
         let paper_dir = PathBuf::from(vault_path).join("papers").join(citekey);
-        fs::create_dir_all(&paper_dir)
+        tokio::fs::create_dir_all(&paper_dir)
+            .await
             .map_err(|e| format!("Failed to create directory: {}", e))?;
 
         let raw_path = paper_dir.join("raw_response.txt");
-        fs::write(&raw_path, raw_content)
+        tokio::fs::write(&raw_path, raw_content)
+            .await
             .map_err(|e| format!("Failed to write raw response: {}", e))?;
 
         let relative_path = format!("papers/{}/raw_response.txt", citekey);
@@ -192,6 +292,68 @@ impl FileSystemAdapter {
         Ok(relative_path)
     }
 
+    /// Load a cached Claude summary response, if one was saved for this prompt
+    ///
+    /// # Arguments
+    /// * `vault_path` - Path to the vault directory
+    /// * `citekey` - Paper citation key
+    /// * `prompt_hash` - Hash of the prompt the response must have been produced for
+    ///
+    /// # Returns
+    /// * `Some(response)` - The cached response JSON
+    /// * `None` - If there is no cache file or it belongs to a different prompt
+    pub async fn load_cached_response(
+        &self,
+        vault_path: &str,
+        citekey: &str,
+        prompt_hash: &str,
+    ) -> Option<String> {
+        let cache_path = PathBuf::from(vault_path)
+            .join("papers")
+            .join(citekey)
+            .join(RESPONSE_CACHE_FILE);
+
+        let content = tokio::fs::read_to_string(&cache_path).await.ok()?;
+        let cached: CachedResponse = serde_json::from_str(&content).ok()?;
+
+        if cached.prompt_hash == prompt_hash {
+            Some(cached.response)
+        } else {
+            None
+        }
+    }
+
+    /// Save a parsed Claude summary response so an identical prompt can reuse it
+    ///
+    /// # Arguments
+    /// * `vault_path` - Path to the vault directory
+    /// * `citekey` - Paper citation key
+    /// * `prompt_hash` - Hash of the prompt that produced the response
+    /// * `response` - The response JSON
+    pub async fn save_cached_response(
+        &self,
+        vault_path: &str,
+        citekey: &str,
+        prompt_hash: &str,
+        response: &str,
+    ) -> Result<(), String> {
+        let paper_dir = PathBuf::from(vault_path).join("papers").join(citekey);
+        tokio::fs::create_dir_all(&paper_dir)
+            .await
+            .map_err(|e| format!("Failed to create directory: {}", e))?;
+
+        let cached = CachedResponse {
+            prompt_hash: prompt_hash.to_string(),
+            response: response.to_string(),
+        };
+        let content = serde_json::to_string(&cached)
+            .map_err(|e| format!("Failed to serialize cached response: {}", e))?;
+
+        write_atomic(&paper_dir.join(RESPONSE_CACHE_FILE), content)
+            .await
+            .map_err(|e| format!("Failed to write cached response: {}", e))
+    }
+
     /// Extract text from a PDF file
     ///
     /// # Arguments
@@ -206,21 +368,65 @@ impl FileSystemAdapter {
         let text = pdf_extract::extract_text(pdf_path)
             .map_err(|e| format!("Failed to extract PDF text: {}", e))?;
 
-        // Clean up text - remove empty lines
-        let cleaned: String = text
-            .lines()
-            .filter(|line| !line.trim().is_empty())
-            .collect::<Vec<_>>()
-            .join("\n");
-
-        // Truncate if too long (Claude has context limits)
+        // Clean up text - remove empty lines - and truncate if too long
+        // (Claude has context limits)
         let max_chars = 100_000;
-        if cleaned.len() > max_chars {
-            debug!("Truncating PDF text from {} to {} chars", cleaned.len(), max_chars);
-            Ok(cleaned[..max_chars].to_string())
-        } else {
-            Ok(cleaned)
+        if text.len() > max_chars {
+            debug!("Truncating PDF text from {} to at most {} chars", text.len(), max_chars);
         }
+        Ok(join_nonblank_lines(&text, max_chars))
+    }
+
+    /// Extract text from a PDF file, reusing the cached text if the PDF is unchanged
+    ///
+    /// The cache file's first line records the PDF's size and modification
+    /// time; any change to the PDF (or a missing stamp) falls back to a full
+    /// extraction, whose result replaces the cache.
+    ///
+    /// # Arguments
+    /// * `pdf_path` - Full path to the PDF file
+    pub fn extract_pdf_text_cached(&self, pdf_path: &PathBuf) -> Result<String, String> {
+        let cache_path = pdf_path.with_file_name(TEXT_CACHE_FILE);
+        let stamp = Self::text_cache_stamp(pdf_path);
+
+        if let Some(stamp) = &stamp {
+            if let Ok(mut cached) = std::fs::read_to_string(&cache_path) {
+                if let Some(end) = cached.find('\n') {
+                    if &cached[..end] == stamp.as_str() {
+                        debug!("Using cached text for: {:?}", pdf_path);
+                        cached.drain(..=end);
+                        return Ok(cached);
+                    }
+                }
+            }
+        }
+
+        let text = self.extract_pdf_text(pdf_path)?;
+
+        if let Some(stamp) = stamp {
+            // Write to a temp file and rename, so a crash can't leave a
+            // truncated cache behind a valid stamp
+            let tmp_path = unique_tmp_path(&cache_path);
+            let written = std::fs::write(&tmp_path, format!("{}\n{}", stamp, text))
+                .and_then(|_| std::fs::rename(&tmp_path, &cache_path));
+            if let Err(e) = written {
+                let _ = std::fs::remove_file(&tmp_path);
+                warn!("Failed to cache extracted text for {:?}: {}", pdf_path, e);
+            }
+        }
+
+        Ok(text)
+    }
+
+    /// Identify a PDF version by size and modification time
+    fn text_cache_stamp(pdf_path: &Path) -> Option<String> {
+        let metadata = std::fs::metadata(pdf_path).ok()?;
+        let modified = metadata
+            .modified()
+            .ok()?
+            .duration_since(std::time::UNIX_EPOCH)
+            .ok()?;
+        Some(format!("pdf-text-v1 {} {}", metadata.len(), modified.as_nanos()))
     }
 
     /// Format summary with YAML frontmatter
@@ -284,6 +490,18 @@ impl Default for FileSystemAdapter {
 mod tests {
     use super::*;
 
+    #[test]
+    fn test_unique_tmp_path() {
+        let path = Path::new("/vault/papers/smith2020/notes.json");
+        let first = unique_tmp_path(path);
+        let second = unique_tmp_path(path);
+
+        // Same directory, so the rename stays atomic, but never the same file
+        assert_eq!(first.parent(), path.parent());
+        assert_ne!(first, second);
+        assert!(first.to_string_lossy().starts_with("/vault/papers/smith2020/notes.json."));
+    }
+
     #[test]
     fn test_format_summary() {
         let paper = Paper {
@@ -2,6 +2,7 @@
 //!
 //! This module contains adapters for external services and APIs:
 //! - Unpaywall: Open access PDF lookup by DOI
+//! - OpenAlex: Open access PDF lookup by DOI across merged sources
 //! - Semantic Scholar: Academic paper search and PDF lookup
 //! - arXiv: Open access preprint lookup
 //! - Claude CLI: LLM-powered PDF search and summarization
@@ -10,6 +11,7 @@
 pub mod arxiv;
 pub mod claude_cli;
 pub mod filesystem;
+pub mod openalex;
 pub mod semantic_scholar;
 pub mod unpaywall;
 
@@ -17,5 +19,6 @@ pub mod unpaywall;
 pub use arxiv::ArxivClient;
 pub use claude_cli::ClaudeCliClient;
 pub use filesystem::FileSystemAdapter;
+pub use openalex::OpenAlexClient;
 pub use semantic_scholar::SemanticScholarClient;
 pub use unpaywall::UnpaywallClient;
@@ -0,0 +1,234 @@
+//! OpenAlex API client
+//!
+//! Provides open access PDF lookup via the OpenAlex works API, which merges
+//! Crossref, Unpaywall and repository data in a single record.
+//! See: https://docs.openalex.org/
+
+use crate::utils::http::{
+    circuit_breakers, is_not_found, is_transient_error, rate_limiters, status_error, with_retry,
+    RetryConfig,
+};
+use reqwest::Client;
+use serde::Deserialize;
+use std::time::Duration;
+use tracing::{debug, warn};
+
+/// Default timeout for OpenAlex API requests
+const DEFAULT_TIMEOUT_SECS: u64 = 30;
+
+/// Only the location fields are needed to find a PDF
+const SELECT_FIELDS: &str = "best_oa_location,locations";
+
+#[derive(Debug, Deserialize)]
+struct WorkResponse {
+    best_oa_location: Option<Location>,
+    locations: Option<Vec<Location>>,
+}
+
+#[derive(Debug, Deserialize)]
+struct SearchResponse {
+    #[serde(default)]
+    results: Vec<WorkResponse>,
+}
+
+#[derive(Debug, Deserialize)]
+struct Location {
+    #[serde(default)]
+    is_oa: bool,
+    pdf_url: Option<String>,
+}
+
+/// Client for the OpenAlex API
+pub struct OpenAlexClient {
+    client: Client,
+    email: String,
+}
+
+impl OpenAlexClient {
+    /// Create a new OpenAlex client
+    ///
+    /// # Arguments
+    /// * `email` - Email sent as `mailto` to use the OpenAlex polite pool
+    pub fn new(email: Option<String>) -> Result<Self, String> {
+        let client = Client::builder()
+            .timeout(Duration::from_secs(DEFAULT_TIMEOUT_SECS))
+            .build()
+            .map_err(|e| format!("Failed to create HTTP client: {}", e))?;
+
+        Ok(Self::with_client(client, email))
+    }
+
+    /// Create a new client with an existing reqwest client
+    pub fn with_client(client: Client, email: Option<String>) -> Self {
+        let email = email
+            .or_else(|| std::env::var("OPENALEX_EMAIL").ok())
+            .unwrap_or_else(|| "marginalia@example.com".to_string());
+
+        Self { client, email }
+    }
+
+    /// Look up an open access PDF URL by DOI
+    ///
+    /// # Arguments
+    /// * `doi` - The DOI to look up
+    ///
+    /// # Returns
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If no open access PDF is available
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_doi(&self, doi: &str) -> Result<Option<String>, String> {
+        let url = format!(
+            "https://api.openalex.org/works/doi:{}?mailto={}&select={}",
+            doi,
+            urlencoding::encode(&self.email),
+            SELECT_FIELDS
+        );
+
+        debug!("OpenAlex lookup for DOI: {}", doi);
+
+        let work: WorkResponse = match self.fetch_with_retry(&url).await {
+            Ok(w) => w,
+            Err(e) if is_not_found(&e) => {
+                debug!("DOI not known to OpenAlex: {}", doi);
+                return Ok(None);
+            }
+            Err(e) => {
+                warn!("OpenAlex lookup failed: {}", e);
+                return Err(e);
+            }
+        };
+
+        let pdf_url = best_pdf_url(work);
+        match &pdf_url {
+            Some(url) => debug!("Found PDF via OpenAlex: {}", url),
+            None => debug!("No open access PDF found via OpenAlex for DOI: {}", doi),
+        }
+        Ok(pdf_url)
+    }
+
+    /// Search for a paper by title and return its open access PDF URL
+    ///
+    /// # Arguments
+    /// * `title` - The paper title to search for
+    ///
+    /// # Returns
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If no matching paper or PDF is available
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_title(&self, title: &str) -> Result<Option<String>, String> {
+        let url = format!(
+            "https://api.openalex.org/works?search={}&per_page=1&mailto={}&select={}",
+            urlencoding::encode(title),
+            urlencoding::encode(&self.email),
+            SELECT_FIELDS
+        );
+
+        debug!("OpenAlex title search: {}", title);
+
+        let data: SearchResponse = match self.fetch_with_retry(&url).await {
+            Ok(d) => d,
+            Err(e) => {
+                warn!("OpenAlex title search failed: {}", e);
+                return Err(e);
+            }
+        };
+
+        let pdf_url = data.results.into_iter().next().and_then(best_pdf_url);
+        match &pdf_url {
+            Some(url) => debug!("Found PDF via OpenAlex title search: {}", url),
+            None => debug!("No open access PDF found via OpenAlex for title: {}", title),
+        }
+        Ok(pdf_url)
+    }
+
+    /// Fetch JSON from a URL with rate limiting and retry logic
+    ///
+    /// Fails without a request while the circuit breaker is open.
+    async fn fetch_with_retry<T: serde::de::DeserializeOwned>(&self, url: &str) -> Result<T, String> {
+        if !circuit_breakers::OPENALEX.allow_request() {
+            debug!("Skipping OpenAlex request: circuit open");
+            return Err("OpenAlex circuit open".to_string());
+        }
+
+        // Wait for rate limit slot
+        rate_limiters::OPENALEX.wait_for_slot("openalex").await;
+
+        let retry_config = RetryConfig {
+            max_retries: 2,
+            initial_backoff: Duration::from_millis(500),
+            max_backoff: Duration::from_secs(10),
+            multiplier: 2.0,
+        };
+
+        let client = self.client.clone();
+        let url_owned = url.to_string();
+
+        let result = with_retry(
+            &retry_config,
+            &format!("OpenAlex request to {}", url),
+            || {
+                let client = client.clone();
+                let url = url_owned.clone();
+                async move {
+                    let resp = client
+                        .get(&url)
+                        .send()
+                        .await
+                        .map_err(|e| format!("request failed: {}", e))?;
+
+                    if !resp.status().is_success() {
+                        return Err(status_error("status", &resp));
+                    }
+
+                    resp.json::<T>()
+                        .await
+                        .map_err(|e| format!("parse failed: {}", e))
+                }
+            },
+            |err| is_transient_error(err),
+        )
+        .await;
+        circuit_breakers::OPENALEX.record(&result);
+
+        result
+    }
+}
+
+/// Pick the PDF URL from best_oa_location, then any other open access location
+fn best_pdf_url(work: WorkResponse) -> Option<String> {
+    let oa_locations = work.locations.unwrap_or_default().into_iter().filter(|loc| loc.is_oa);
+    work.best_oa_location
+        .into_iter()
+        .chain(oa_locations)
+        .filter_map(|loc| loc.pdf_url)
+        .find(|url| !url.is_empty())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[tokio::test]
+    async fn test_openalex_client_creation() {
+        let client = OpenAlexClient::new(Some("test@example.com".to_string()));
+        assert!(client.is_ok());
+    }
+
+    #[test]
+    fn test_best_pdf_url_skips_closed_locations() {
+        let work: WorkResponse = serde_json::from_str(
+            r#"{
+                "best_oa_location": null,
+                "locations": [
+                    {"is_oa": false, "pdf_url": "https://publisher.example/paywalled.pdf"},
+                    {"is_oa": true, "pdf_url": null},
+                    {"is_oa": true, "pdf_url": "https://repository.example/open.pdf"}
+                ]
+            }"#,
+        )
+        .unwrap();
+        assert_eq!(best_pdf_url(work).as_deref(), Some("https://repository.example/open.pdf"));
+    }
+}
@@ -3,7 +3,10 @@
 //! Provides academic paper search and open access PDF lookup.
 //! See: https://api.semanticscholar.org/
 
-use crate::utils::http::{rate_limiters, with_retry, RetryConfig};
+use crate::utils::http::{
+    circuit_breakers, is_not_found, is_transient_error, rate_limiters, status_error, with_retry,
+    RetryConfig,
+};
 use reqwest::Client;
 use serde::Deserialize;
 use std::time::Duration;
@@ -71,9 +74,16 @@ impl SemanticScholarClient {
     /// * `doi` - The DOI to look up
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if found
-    /// * `None` - If no open access PDF is available
-    pub async fn find_pdf_by_doi(&self, doi: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If no open access PDF is available
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_doi(&self, doi: &str) -> Result<Option<String>, String> {
+        if !circuit_breakers::SEMANTIC_SCHOLAR.allow_request() {
+            debug!("Skipping Semantic Scholar request: circuit open");
+            return Err("Semantic Scholar circuit open".to_string());
+        }
+
         // Wait for rate limit slot
         rate_limiters::SEMANTIC_SCHOLAR
             .wait_for_slot("semantic_scholar")
@@ -97,21 +107,25 @@ impl SemanticScholarClient {
 
         let data: PaperResponse = match result {
             Ok(d) => d,
+            Err(e) if is_not_found(&e) => {
+                debug!("DOI not known to Semantic Scholar: {}", doi);
+                return Ok(None);
+            }
             Err(e) => {
                 warn!("Semantic Scholar DOI lookup failed: {}", e);
-                return None;
+                return Err(e);
             }
         };
 
         if let Some(pdf) = data.open_access_pdf {
             if let Some(url) = pdf.url {
                 debug!("Found PDF via Semantic Scholar DOI: {}", url);
-                return Some(url);
+                return Ok(Some(url));
             }
         }
 
         debug!("No open access PDF found via Semantic Scholar for DOI: {}", doi);
-        None
+        Ok(None)
     }
 
     /// Search for a paper by title and return open access PDF URL
@@ -120,9 +134,16 @@ impl SemanticScholarClient {
     /// * `title` - The paper title to search for
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if found
-    /// * `None` - If no matching paper or PDF is available
-    pub async fn find_pdf_by_title(&self, title: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If no matching paper or PDF is available
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_title(&self, title: &str) -> Result<Option<String>, String> {
+        if !circuit_breakers::SEMANTIC_SCHOLAR.allow_request() {
+            debug!("Skipping Semantic Scholar request: circuit open");
+            return Err("Semantic Scholar circuit open".to_string());
+        }
+
         // Wait for rate limit slot
         rate_limiters::SEMANTIC_SCHOLAR
             .wait_for_slot("semantic_scholar")
@@ -147,7 +168,7 @@ impl SemanticScholarClient {
             Ok(d) => d,
             Err(e) => {
                 warn!("Semantic Scholar title search failed: {}", e);
-                return None;
+                return Err(e);
             }
         };
 
@@ -156,14 +177,14 @@ impl SemanticScholarClient {
                 if let Some(ref pdf) = first.open_access_pdf {
                     if let Some(ref url) = pdf.url {
                         debug!("Found PDF via Semantic Scholar title search: {}", url);
-                        return Some(url.clone());
+                        return Ok(Some(url.clone()));
                     }
                 }
             }
         }
 
         debug!("No open access PDF found via Semantic Scholar for title: {}", title);
-        None
+        Ok(None)
     }
 
     /// Fetch JSON from a URL with retry logic
@@ -176,7 +197,7 @@ impl SemanticScholarClient {
         let api_key = self.api_key.clone();
         let url_owned = url.to_string();
 
-        with_retry(
+        let result = with_retry(
             config,
             &format!("Semantic Scholar request to {}", url),
             || {
@@ -195,7 +216,7 @@ impl SemanticScholarClient {
                         .map_err(|e| format!("request failed: {}", e))?;
 
                     if !resp.status().is_success() {
-                        return Err(format!("status: {}", resp.status()));
+                        return Err(status_error("status", &resp));
                     }
 
                     resp.json::<T>()
@@ -203,14 +224,11 @@ impl SemanticScholarClient {
                         .map_err(|e| format!("parse failed: {}", e))
                 }
             },
-            |err| {
-                // Retry on network errors and 5xx/429 status codes
-                err.contains("request failed")
-                    || err.contains("status: 5")
-                    || err.contains("status: 429")
-            },
+            |err| is_transient_error(err),
         )
-        .await
+        .await;
+        circuit_breakers::SEMANTIC_SCHOLAR.record(&result);
+        result
     }
 }
 
@@ -3,7 +3,10 @@
 //! Provides open access PDF lookup via the Unpaywall API.
 //! See: https://unpaywall.org/products/api
 
-use crate::utils::http::{rate_limiters, with_retry, RetryConfig};
+use crate::utils::http::{
+    circuit_breakers, is_not_found, is_transient_error, rate_limiters, status_error, with_retry,
+    RetryConfig,
+};
 use reqwest::Client;
 use serde::Deserialize;
 use std::time::Duration;
@@ -62,9 +65,16 @@ impl UnpaywallClient {
     /// * `doi` - The DOI to look up
     ///
     /// # Returns
-    /// * `Some(url)` - Direct PDF URL if found
-    /// * `None` - If no open access PDF is available
-    pub async fn find_pdf_by_doi(&self, doi: &str) -> Option<String> {
+    /// * `Ok(Some(url))` - Direct PDF URL if found
+    /// * `Ok(None)` - If no open access PDF is available
+    /// * `Err(error)` - If the source could not be asked (network or server
+    ///   error, or its circuit is open), so the answer is unknown
+    pub async fn find_pdf_by_doi(&self, doi: &str) -> Result<Option<String>, String> {
+        if !circuit_breakers::UNPAYWALL.allow_request() {
+            debug!("Skipping Unpaywall lookup: circuit open");
+            return Err("Unpaywall circuit open".to_string());
+        }
+
         // Wait for rate limit slot
         rate_limiters::UNPAYWALL.wait_for_slot("unpaywall").await;
 
@@ -99,7 +109,7 @@ impl UnpaywallClient {
                         .map_err(|e| format!("request failed: {}", e))?;
 
                     if !resp.status().is_success() {
-                        return Err(format!("status: {}", resp.status()));
+                        return Err(status_error("status", &resp));
                     }
 
                     resp.json::<UnpaywallResponse>()
@@ -107,20 +117,20 @@ impl UnpaywallClient {
                         .map_err(|e| format!("parse failed: {}", e))
                 }
             },
-            |err| {
-                // Retry on network errors and 5xx/429 status codes
-                err.contains("request failed")
-                    || err.contains("status: 5")
-                    || err.contains("status: 429")
-            },
+            |err| is_transient_error(err),
         )
         .await;
+        circuit_breakers::UNPAYWALL.record(&result);
 
         let data = match result {
             Ok(d) => d,
+            Err(e) if is_not_found(&e) => {
+                debug!("DOI not known to Unpaywall: {}", doi);
+                return Ok(None);
+            }
             Err(e) => {
                 warn!("Unpaywall lookup failed: {}", e);
-                return None;
+                return Err(e);
             }
         };
 
@@ -129,7 +139,7 @@ impl UnpaywallClient {
             if let Some(pdf_url) = best_loc.url_for_pdf {
                 if !pdf_url.is_empty() {
                     debug!("Found PDF via Unpaywall best_oa_location: {}", pdf_url);
-                    return Some(pdf_url);
+                    return Ok(Some(pdf_url));
                 }
             }
         }
@@ -140,14 +150,14 @@ impl UnpaywallClient {
                 if let Some(pdf_url) = loc.url_for_pdf {
                     if !pdf_url.is_empty() {
                         debug!("Found PDF via Unpaywall oa_locations: {}", pdf_url);
-                        return Some(pdf_url);
+                        return Ok(Some(pdf_url));
                     }
                 }
             }
         }
 
         debug!("No open access PDF found via Unpaywall for DOI: {}", doi);
-        None
+        Ok(None)
     }
 }
 
@@ -6,6 +6,8 @@ use crate::adapters::{ClaudeCliClient, FileSystemAdapter};
 use crate::models::{Paper, PaperStatus, RelatedPaper};
 use crate::services::{SummarizationResult, SummarizerService};
 use crate::storage::PaperRepo;
+use crate::utils::http::shared_client;
+use crate::utils::text::{normalize_author, normalize_title};
 use crate::AppState;
 use chrono::Utc;
 use std::collections::HashMap;
@@ -54,6 +56,7 @@ pub struct SummaryResult {
 pub async fn summarize_paper(
     vault_path: String,
     citekey: String,
+    force: Option<bool>,
     state: State<'_, AppState>,
 ) -> Result<SummaryResult, String> {
     // Check Claude availability
@@ -92,14 +95,22 @@ pub async fn summarize_paper(
     }
 
     // Initialize services
-    let filesystem = FileSystemAdapter::new()?;
+    let filesystem = FileSystemAdapter::with_client(shared_client());
     let summarizer = SummarizerService::with_filesystem(filesystem.clone());
 
-    // Extract text from PDF
-    let text = filesystem.extract_pdf_text(&full_pdf_path)?;
+    // Extract text from PDF (or reuse it if the PDF is unchanged); parsing is
+    // CPU-bound, so keep it off the async runtime
+    let text = {
+        let filesystem = filesystem.clone();
+        tokio::task::spawn_blocking(move || filesystem.extract_pdf_text_cached(&full_pdf_path))
+            .await
+            .map_err(|e| format!("Failed to extract PDF text: {}", e))??
+    };
 
     // Call summarizer service with JSON output validation
-    let result = summarizer.summarize(&vault_path, &paper, &text).await;
+    let result = summarizer
+        .summarize(&vault_path, &paper, &text, force.unwrap_or(false))
+        .await;
 
     match result {
         SummarizationResult::Success {
@@ -107,7 +118,7 @@ pub async fn summarize_paper(
             related_papers,
         } => {
             // Save the formatted markdown
-            let summary_path = filesystem.save_summary(&vault_path, &paper, &markdown)?;
+            let summary_path = filesystem.save_summary(&vault_path, &paper, &markdown).await?;
 
             // Update paper in database with auto-linked related papers
             {
@@ -117,7 +128,7 @@ pub async fn summarize_paper(
 
                 // Fetch all vault papers for auto-linking
                 let vault_papers = paper_repo
-                    .get_all()
+                    .get_all_shallow()
                     .map_err(|e| format!("Failed to get vault papers: {}", e))?;
 
                 // Auto-link related papers to vault papers by title/author matching
@@ -177,95 +188,105 @@ fn auto_link_related_papers(
     related_papers: Vec<RelatedPaper>,
     vault_papers: &HashMap<String, Paper>,
 ) -> Vec<RelatedPaper> {
+    // Normalize every vault paper once instead of once per related paper
+    let index = VaultMatchIndex::build(vault_papers);
+
     related_papers
         .into_iter()
         .map(|mut related| {
             // Try to find a matching paper in the vault
-            if let Some(matched_citekey) = find_vault_match(&related, vault_papers) {
+            if let Some(matched_citekey) = index.find(&related) {
                 info!(
                     "Auto-linked related paper '{}' to vault paper '{}'",
                     related.title, matched_citekey
                 );
-                related.vault_citekey = Some(matched_citekey);
+                related.vault_citekey = Some(matched_citekey.to_string());
             }
             related
         })
         .collect()
 }
 
-/// Find a vault paper that matches the related paper by title or author+year
-fn find_vault_match(related: &RelatedPaper, vault_papers: &HashMap<String, Paper>) -> Option<String> {
-    let related_title_normalized = normalize_title(&related.title);
-    let related_first_author = related
-        .authors
-        .first()
-        .map(|a| normalize_author(a))
-        .unwrap_or_default();
-
-    for (citekey, paper) in vault_papers {
-        // Check by normalized title
-        let paper_title_normalized = normalize_title(&paper.title);
-        if !related_title_normalized.is_empty()
-            && titles_match(&related_title_normalized, &paper_title_normalized)
-        {
-            return Some(citekey.clone());
-        }
-
-        // Check by first author + year
-        if let Some(paper_first_author) = paper.authors.first() {
-            let paper_author_normalized = normalize_author(paper_first_author);
-            if related.year == paper.year
-                && !related_first_author.is_empty()
-                && related_first_author == paper_author_normalized
-            {
-                return Some(citekey.clone());
-            }
-        }
-    }
-
-    None
+/// Lookup tables over normalized vault titles and first authors
+///
+/// Building this is O(V); each lookup is then a few hash probes, so linking
+/// R related papers costs O(R + V) instead of O(R * V).
+struct VaultMatchIndex<'a> {
+    /// Full normalized title -> citekey
+    by_title: HashMap<String, &'a str>,
+    /// First five normalized title words -> citekey (for abbreviated titles)
+    by_title_prefix: HashMap<String, &'a str>,
+    /// (normalized first-author last name, year) -> citekey
+    by_author_year: HashMap<(String, Option<i32>), &'a str>,
 }
 
-fn normalize_title(title: &str) -> String {
-    title
-        .to_lowercase()
-        .chars()
-        .filter(|c| c.is_alphanumeric() || c.is_whitespace())
-        .collect::<String>()
-        .split_whitespace()
-        .collect::<Vec<_>>()
-        .join(" ")
-}
+impl<'a> VaultMatchIndex<'a> {
+    fn build(vault_papers: &'a HashMap<String, Paper>) -> Self {
+        let mut index = Self {
+            by_title: HashMap::with_capacity(vault_papers.len()),
+            by_title_prefix: HashMap::with_capacity(vault_papers.len()),
+            by_author_year: HashMap::with_capacity(vault_papers.len()),
+        };
+
+        for (citekey, paper) in vault_papers {
+            let title = normalize_title(&paper.title);
+            if let Some(prefix) = title_prefix_key(&title) {
+                index.by_title_prefix.entry(prefix).or_insert(citekey);
+            }
+            if !title.is_empty() {
+                index.by_title.entry(title).or_insert(citekey);
+            }
 
-fn normalize_author(author: &str) -> String {
-    // Extract last name, handling "Firstname Lastname" and "Lastname, Firstname"
-    let name = if author.contains(',') {
-        author.split(',').next().unwrap_or(author).trim()
-    } else {
-        author.split_whitespace().last().unwrap_or(author)
-    };
-    name.to_lowercase()
-        .chars()
-        .filter(|c| c.is_alphanumeric())
-        .collect()
-}
+            if let Some(first_author) = paper.authors.first() {
+                let author = normalize_author(first_author);
+                if !author.is_empty() {
+                    index
+                        .by_author_year
+                        .entry((author, paper.year))
+                        .or_insert(citekey);
+                }
+            }
+        }
 
-fn titles_match(t1: &str, t2: &str) -> bool {
-    if t1 == t2 {
-        return true;
+        index
     }
 
-    // Check if first 5 significant words match (for abbreviated titles)
-    if t1.len() > 10 && t2.len() > 10 {
-        let words1: Vec<_> = t1.split_whitespace().take(5).collect();
-        let words2: Vec<_> = t2.split_whitespace().take(5).collect();
+    /// Find a vault paper that matches the related paper by title or author+year
+    fn find(&self, related: &RelatedPaper) -> Option<&'a str> {
+        let title = normalize_title(&related.title);
+        if !title.is_empty() {
+            if let Some(citekey) = self.by_title.get(&title) {
+                return Some(*citekey);
+            }
+            if let Some(citekey) = title_prefix_key(&title).and_then(|k| self.by_title_prefix.get(&k)) {
+                return Some(*citekey);
+            }
+        }
 
-        if words1.len() >= 3 && words1 == words2 {
-            return true;
+        let author = related
+            .authors
+            .first()
+            .map(|a| normalize_author(a))
+            .unwrap_or_default();
+        if author.is_empty() {
+            return None;
         }
+        self.by_author_year.get(&(author, related.year)).copied()
     }
+}
 
-    false
+/// Key used to match abbreviated titles: the first five words of a
+/// normalized title, if it is long enough to be meaningful
+fn title_prefix_key(normalized_title: &str) -> Option<String> {
+    if normalized_title.len() <= 10 {
+        return None;
+    }
+    let words: Vec<_> = normalized_title.split_whitespace().take(5).collect();
+    if words.len() >= 3 {
+        Some(words.join(" "))
+    } else {
+        None
+    }
 }
 
 /// Read the raw response file for a paper (saved when summarization parse fails)
@@ -283,6 +304,63 @@ pub async fn read_raw_response(vault_path: String, citekey: String) -> Result<St
         ));
     }
 
-    std::fs::read_to_string(&raw_response_path)
+    tokio::fs::read_to_string(&raw_response_path)
+        .await
         .map_err(|e| format!("Failed to read raw response: {}", e))
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn vault() -> HashMap<String, Paper> {
+        let mut papers = HashMap::new();
+
+        let mut smith = Paper::new(
+            "smith2020".to_string(),
+            "Learning to Rank: A Survey of Methods".to_string(),
+        );
+        smith.authors = vec!["Smith, John".to_string()];
+        smith.year = Some(2020);
+        papers.insert(smith.citekey.clone(), smith);
+
+        let mut doe = Paper::new("doe2018".to_string(), "Short".to_string());
+        doe.authors = vec!["Jane Doe".to_string()];
+        doe.year = Some(2018);
+        papers.insert(doe.citekey.clone(), doe);
+
+        papers
+    }
+
+    fn related(title: &str, authors: &[&str], year: Option<i32>) -> RelatedPaper {
+        RelatedPaper {
+            title: title.to_string(),
+            authors: authors.iter().map(|a| a.to_string()).collect(),
+            year,
+            why_related: String::new(),
+            vault_citekey: None,
+        }
+    }
+
+    #[test]
+    fn test_vault_match_by_title() {
+        let papers = vault();
+        let index = VaultMatchIndex::build(&papers);
+
+        let exact = related("learning to rank - a survey of methods", &[], None);
+        assert_eq!(index.find(&exact), Some("smith2020"));
+
+        let abbreviated = related("Learning to Rank: A Survey", &[], None);
+        assert_eq!(index.find(&abbreviated), Some("smith2020"));
+    }
+
+    #[test]
+    fn test_vault_match_by_author_year() {
+        let papers = vault();
+        let index = VaultMatchIndex::build(&papers);
+
+        assert_eq!(index.find(&related("Other", &["J. Doe"], Some(2018))), Some("doe2018"));
+        assert_eq!(index.find(&related("Other", &["J. Doe"], Some(2019))), None);
+        assert_eq!(index.find(&related("Other", &[], Some(2018))), None);
+    }
+}
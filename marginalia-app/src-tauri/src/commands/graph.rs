@@ -1,6 +1,5 @@
 //! Graph commands for paper network visualization
 
-use crate::models::PaperStatus;
 use crate::storage::{PaperRepo, ConnectionRepo};
 use crate::AppState;
 use tauri::State;
@@ -33,33 +32,25 @@ pub async fn get_graph(
     vault_path: String,
     state: State<'_, AppState>,
 ) -> Result<GraphData, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+    let db_guard = state.read_db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
     let paper_repo = PaperRepo::new(&db.conn);
     let conn_repo = ConnectionRepo::new(&db.conn);
 
-    let papers = paper_repo.get_all()
+    // Nodes only need each paper's own columns, not its citations or related papers
+    let papers = paper_repo.get_all_shallow()
         .map_err(|e| format!("Failed to get papers: {}", e))?;
 
     let connections = conn_repo.get_all()
         .map_err(|e| format!("Failed to get connections: {}", e))?;
 
     let nodes: Vec<GraphNode> = papers.values().map(|p| {
-        let group = match p.status {
-            PaperStatus::Discovered => "discovered",
-            PaperStatus::Wanted => "wanted",
-            PaperStatus::Queued => "queued",
-            PaperStatus::Downloaded => "downloaded",
-            PaperStatus::Summarized => "summarized",
-            PaperStatus::Failed => "failed",
-        };
-
         GraphNode {
             id: p.citekey.clone(),
             label: p.citekey.clone(),
             title: p.title.clone(),
-            group: group.to_string(),
+            group: p.status.as_str().to_string(),
             year: p.year,
         }
     }).collect();
@@ -98,8 +89,7 @@ pub async fn connect_papers(
     }
 
     // Check if connection already exists (in either direction)
-    if conn_repo.exists(&source, &target).unwrap_or(false) ||
-       conn_repo.exists(&target, &source).unwrap_or(false) {
+    if conn_repo.exists_between(&source, &target).unwrap_or(false) {
         return Ok("exists".to_string());
     }
 
@@ -124,12 +114,10 @@ pub async fn disconnect_papers(
     let conn_repo = ConnectionRepo::new(&db.conn);
 
     // Try to remove in both directions
-    let removed1 = conn_repo.remove(&source, &target)
-        .map_err(|e| format!("Failed to remove connection: {}", e))?;
-    let removed2 = conn_repo.remove(&target, &source)
+    let removed = conn_repo.remove_between(&source, &target)
         .map_err(|e| format!("Failed to remove connection: {}", e))?;
 
-    if removed1 == 0 && removed2 == 0 {
+    if removed == 0 {
         return Err("Connection not found".to_string());
     }
 
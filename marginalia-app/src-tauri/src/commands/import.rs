@@ -3,8 +3,9 @@
 use crate::models::{Paper, PaperStatus};
 use crate::storage::PaperRepo;
 use crate::AppState;
-use std::fs;
 use biblatex::{Bibliography, ChunksExt, PermissiveType};
+use std::fmt::Write as _;
+use tokio::io::{AsyncWriteExt, BufWriter};
 use tauri::State;
 use tracing::{info, warn};
 
@@ -21,31 +22,31 @@ pub async fn import_bibtex(
     bib_path: String,
     state: State<'_, AppState>,
 ) -> Result<ImportResult, String> {
-    let bib_content = fs::read_to_string(&bib_path)
+    let bib_content = tokio::fs::read_to_string(&bib_path)
+        .await
         .map_err(|e| format!("Failed to read BibTeX file: {}", e))?;
 
+    // Parse BibTeX entries off the async runtime; large libraries take a while
+    let entries = tokio::task::spawn_blocking(move || parse_bibtex(&bib_content))
+        .await
+        .map_err(|e| format!("Failed to parse BibTeX: {}", e))??;
+
     let db_guard = state.db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let paper_repo = PaperRepo::new(&db.conn);
+    // Write all entries in one transaction rather than one commit per paper
+    let tx = db.conn.unchecked_transaction()
+        .map_err(|e| format!("Failed to start transaction: {}", e))?;
 
-    let mut added = 0;
-    let mut updated = 0;
+    let paper_repo = PaperRepo::new(&tx);
 
-    // Parse BibTeX entries
-    let entries = parse_bibtex(&bib_content)?;
+    // New papers are inserted; existing ones are refreshed only while still
+    // Discovered, so a re-import never resets a downloaded or summarized paper
+    let (added, updated) = paper_repo.import_papers(&entries)
+        .map_err(|e| format!("Failed to import papers: {}", e))?;
 
-    for entry in entries {
-        if paper_repo.exists(&entry.citekey).unwrap_or(false) {
-            paper_repo.update(&entry)
-                .map_err(|e| format!("Failed to update paper: {}", e))?;
-            updated += 1;
-        } else {
-            paper_repo.insert(&entry)
-                .map_err(|e| format!("Failed to insert paper: {}", e))?;
-            added += 1;
-        }
-    }
+    tx.commit()
+        .map_err(|e| format!("Failed to commit import: {}", e))?;
 
     info!("Imported {} new, {} updated papers from {}", added, updated, bib_path);
 
@@ -221,40 +222,59 @@ pub async fn export_bibtex(
     output_path: String,
     state: State<'_, AppState>,
 ) -> Result<(), String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
-    let db = db_guard.as_ref().ok_or("No vault is open")?;
+    let papers = {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let paper_repo = PaperRepo::new(&db.conn);
-    let papers = paper_repo.get_all()
-        .map_err(|e| format!("Failed to get papers: {}", e))?;
+        let paper_repo = PaperRepo::new(&db.conn);
+        paper_repo.get_all_shallow()
+            .map_err(|e| format!("Failed to get papers: {}", e))?
+    };
 
-    let mut content = String::new();
+    let file = tokio::fs::File::create(&output_path)
+        .await
+        .map_err(|e| format!("Failed to write BibTeX: {}", e))?;
+    let mut writer = BufWriter::new(file);
 
+    // Format one entry at a time into a reused buffer and stream it out,
+    // rather than holding the whole export in memory
+    let mut entry = String::new();
     for paper in papers.values() {
-        content.push_str(&format!("@article{{{},\n", paper.citekey));
-        content.push_str(&format!("  title = {{{}}},\n", paper.title));
-
-        if !paper.authors.is_empty() {
-            content.push_str(&format!("  author = {{{}}},\n", paper.authors.join(" and ")));
-        }
-        if let Some(year) = paper.year {
-            content.push_str(&format!("  year = {{{}}},\n", year));
-        }
-        if let Some(journal) = &paper.journal {
-            content.push_str(&format!("  journal = {{{}}},\n", journal));
-        }
-        if let Some(doi) = &paper.doi {
-            content.push_str(&format!("  doi = {{{}}},\n", doi));
-        }
-        if let Some(url) = &paper.url {
-            content.push_str(&format!("  url = {{{}}},\n", url));
-        }
-        content.push_str("}\n\n");
+        entry.clear();
+        write_bibtex_entry(&mut entry, paper);
+        writer.write_all(entry.as_bytes())
+            .await
+            .map_err(|e| format!("Failed to write BibTeX: {}", e))?;
     }
 
-    fs::write(&output_path, content)
+    writer.flush()
+        .await
         .map_err(|e| format!("Failed to write BibTeX: {}", e))?;
 
     info!("Exported {} papers to {}", papers.len(), output_path);
     Ok(())
 }
+
+/// Append a paper as an @article BibTeX entry
+fn write_bibtex_entry(out: &mut String, paper: &Paper) {
+    // Writing to a String cannot fail
+    let _ = writeln!(out, "@article{{{},", paper.citekey);
+    let _ = writeln!(out, "  title = {{{}}},", paper.title);
+
+    if !paper.authors.is_empty() {
+        let _ = writeln!(out, "  author = {{{}}},", paper.authors.join(" and "));
+    }
+    if let Some(year) = paper.year {
+        let _ = writeln!(out, "  year = {{{}}},", year);
+    }
+    if let Some(journal) = &paper.journal {
+        let _ = writeln!(out, "  journal = {{{}}},", journal);
+    }
+    if let Some(doi) = &paper.doi {
+        let _ = writeln!(out, "  doi = {{{}}},", doi);
+    }
+    if let Some(url) = &paper.url {
+        let _ = writeln!(out, "  url = {{{}}},", url);
+    }
+    out.push_str("}\n\n");
+}
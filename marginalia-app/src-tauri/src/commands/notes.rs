@@ -1,15 +1,36 @@
 //! Notes and highlights commands
 
+use crate::adapters::filesystem::write_atomic;
 use crate::models::{PaperNotes, Highlight, HighlightRect};
 use crate::storage::NotesRepo;
 use crate::AppState;
+use once_cell::sync::Lazy;
+use std::collections::HashMap;
 use std::path::PathBuf;
 use std::fs;
+use std::sync::Arc;
 use chrono::Utc;
 use uuid::Uuid;
 use tauri::State;
 use tracing::info;
 
+/// Per-paper locks ordering notes.json mirror writes
+///
+/// Held from the database snapshot through the file write, so overlapping
+/// commands for one paper (an autosave and a highlight edit) write their
+/// snapshots in the order they took them and the newest one lands last.
+static NOTES_FILE_LOCKS: Lazy<std::sync::Mutex<HashMap<String, Arc<tokio::sync::Mutex<()>>>>> =
+    Lazy::new(Default::default);
+
+/// Wait for exclusive use of a paper's notes.json mirror
+async fn lock_notes_file(citekey: &str) -> tokio::sync::OwnedMutexGuard<()> {
+    let lock = {
+        let mut locks = NOTES_FILE_LOCKS.lock().unwrap_or_else(|e| e.into_inner());
+        locks.entry(citekey.to_string()).or_default().clone()
+    };
+    lock.lock_owned().await
+}
+
 #[tauri::command]
 pub async fn get_notes(
     vault_path: String,
@@ -27,10 +48,7 @@ pub async fn get_notes(
     }
 
     // Fall back to file if not in database (for migration)
-    let notes_path = PathBuf::from(&vault_path)
-        .join("papers")
-        .join(&citekey)
-        .join("notes.json");
+    let notes_path = notes_file_path(&vault_path, &citekey);
 
     if notes_path.exists() {
         let content = fs::read_to_string(&notes_path)
@@ -59,31 +77,25 @@ pub async fn save_notes(
     content: String,
     state: State<'_, AppState>,
 ) -> Result<(), String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
-    let db = db_guard.as_ref().ok_or("No vault is open")?;
-
-    let notes_repo = NotesRepo::new(&db.conn);
+    let _file_lock = lock_notes_file(&citekey).await;
 
-    // Save to database
-    notes_repo.update_content(&citekey, &content)
-        .map_err(|e| format!("Failed to save notes: {}", e))?;
-
-    // Also save to file for portability
-    let paper_dir = PathBuf::from(&vault_path).join("papers").join(&citekey);
-    fs::create_dir_all(&paper_dir)
-        .map_err(|e| format!("Failed to create directory: {}", e))?;
+    let notes = {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let notes_path = paper_dir.join("notes.json");
+        let notes_repo = NotesRepo::new(&db.conn);
 
-    // Get full notes from database to write to file
-    let notes = notes_repo.get_or_create(&citekey)
-        .map_err(|e| format!("Failed to get notes: {}", e))?;
+        // Save to database
+        notes_repo.update_content(&citekey, &content)
+            .map_err(|e| format!("Failed to save notes: {}", e))?;
 
-    let json = serde_json::to_string_pretty(&notes)
-        .map_err(|e| format!("Failed to serialize notes: {}", e))?;
+        // Get full notes from database to write to file
+        notes_repo.get_or_create(&citekey)
+            .map_err(|e| format!("Failed to get notes: {}", e))?
+    };
 
-    fs::write(&notes_path, json)
-        .map_err(|e| format!("Failed to write notes: {}", e))?;
+    // Also save to file for portability
+    write_notes_file(&vault_path, &notes).await?;
 
     info!("Saved notes for {}", citekey);
     Ok(())
@@ -105,11 +117,6 @@ pub async fn add_highlight(
     highlight: AddHighlightRequest,
     state: State<'_, AppState>,
 ) -> Result<String, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
-    let db = db_guard.as_ref().ok_or("No vault is open")?;
-
-    let notes_repo = NotesRepo::new(&db.conn);
-
     let highlight_id = Uuid::new_v4().to_string()[..16].to_string();
 
     let new_highlight = Highlight {
@@ -122,26 +129,25 @@ pub async fn add_highlight(
         created_at: Utc::now(),
     };
 
-    // Save to database
-    notes_repo.add_highlight(&citekey, &new_highlight)
-        .map_err(|e| format!("Failed to add highlight: {}", e))?;
+    let _file_lock = lock_notes_file(&citekey).await;
 
-    // Also update the file
-    let paper_dir = PathBuf::from(&vault_path).join("papers").join(&citekey);
-    fs::create_dir_all(&paper_dir)
-        .map_err(|e| format!("Failed to create directory: {}", e))?;
+    let notes = {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let notes_path = paper_dir.join("notes.json");
+        let notes_repo = NotesRepo::new(&db.conn);
 
-    // Get full notes from database to write to file
-    let notes = notes_repo.get_or_create(&citekey)
-        .map_err(|e| format!("Failed to get notes: {}", e))?;
+        // Save to database
+        notes_repo.add_highlight(&citekey, &new_highlight)
+            .map_err(|e| format!("Failed to add highlight: {}", e))?;
 
-    let json = serde_json::to_string_pretty(&notes)
-        .map_err(|e| format!("Failed to serialize notes: {}", e))?;
+        // Get full notes from database to write to file
+        notes_repo.get_or_create(&citekey)
+            .map_err(|e| format!("Failed to get notes: {}", e))?
+    };
 
-    fs::write(&notes_path, json)
-        .map_err(|e| format!("Failed to write notes: {}", e))?;
+    // Also update the file
+    write_notes_file(&vault_path, &notes).await?;
 
     info!("Added highlight {} to {}", highlight_id, citekey);
     Ok(highlight_id)
@@ -154,37 +160,61 @@ pub async fn delete_highlight(
     highlight_id: String,
     state: State<'_, AppState>,
 ) -> Result<(), String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
-    let db = db_guard.as_ref().ok_or("No vault is open")?;
+    let _file_lock = lock_notes_file(&citekey).await;
 
-    let notes_repo = NotesRepo::new(&db.conn);
+    let notes = {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    // Delete from database
-    let deleted = notes_repo.delete_highlight(&citekey, &highlight_id)
-        .map_err(|e| format!("Failed to delete highlight: {}", e))?;
+        let notes_repo = NotesRepo::new(&db.conn);
 
-    if !deleted {
-        return Err("Highlight not found".to_string());
-    }
+        // Delete from database
+        let deleted = notes_repo.delete_highlight(&citekey, &highlight_id)
+            .map_err(|e| format!("Failed to delete highlight: {}", e))?;
 
-    // Update the file
-    let notes_path = PathBuf::from(&vault_path)
-        .join("papers")
-        .join(&citekey)
-        .join("notes.json");
+        if !deleted {
+            return Err("Highlight not found".to_string());
+        }
 
-    if notes_path.exists() {
         // Get updated notes from database to write to file
-        let notes = notes_repo.get_or_create(&citekey)
-            .map_err(|e| format!("Failed to get notes: {}", e))?;
-
-        let json = serde_json::to_string_pretty(&notes)
-            .map_err(|e| format!("Failed to serialize notes: {}", e))?;
+        notes_repo.get_or_create(&citekey)
+            .map_err(|e| format!("Failed to get notes: {}", e))?
+    };
 
-        fs::write(&notes_path, json)
-            .map_err(|e| format!("Failed to write notes: {}", e))?;
+    // Update the file, but only if the paper already has one
+    if notes_file_path(&vault_path, &citekey).exists() {
+        write_notes_file(&vault_path, &notes).await?;
     }
 
     info!("Deleted highlight {} from {}", highlight_id, citekey);
     Ok(())
 }
+
+/// Path of the portable notes.json mirror for a paper
+fn notes_file_path(vault_path: &str, citekey: &str) -> PathBuf {
+    PathBuf::from(vault_path)
+        .join("papers")
+        .join(citekey)
+        .join("notes.json")
+}
+
+/// Write the notes.json mirror for a paper
+///
+/// Called after the database lock is released so file I/O never holds up
+/// other commands; callers hold the paper's `lock_notes_file` guard so
+/// mirror writes can't land out of order.
+async fn write_notes_file(vault_path: &str, notes: &PaperNotes) -> Result<(), String> {
+    let notes_path = notes_file_path(vault_path, &notes.citekey);
+    if let Some(paper_dir) = notes_path.parent() {
+        tokio::fs::create_dir_all(paper_dir)
+            .await
+            .map_err(|e| format!("Failed to create directory: {}", e))?;
+    }
+
+    let json = serde_json::to_string_pretty(notes)
+        .map_err(|e| format!("Failed to serialize notes: {}", e))?;
+
+    write_atomic(&notes_path, json)
+        .await
+        .map_err(|e| format!("Failed to write notes: {}", e))
+}
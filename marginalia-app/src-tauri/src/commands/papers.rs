@@ -2,6 +2,7 @@
 
 use crate::models::{Paper, PaperStatus, VaultStats};
 use crate::storage::PaperRepo;
+use crate::utils::text::{normalize_author, normalize_title};
 use crate::AppState;
 use std::path::PathBuf;
 use std::fs;
@@ -24,7 +25,14 @@ pub async fn get_papers(
     offset: Option<i64>,
     state: State<'_, AppState>,
 ) -> Result<PapersResponse, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+    // Reject unknown statuses up front instead of running a query that can't match
+    if let Some(ref s) = status {
+        if PaperStatus::from_str(s).is_none() {
+            return Err(format!("Invalid status: {}", s));
+        }
+    }
+
+    let db_guard = state.read_db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
     let paper_repo = PaperRepo::new(&db.conn);
@@ -38,11 +46,10 @@ pub async fn get_papers(
     // Get total count
     let total = if let Some(ref status_filter) = status {
         paper_repo.count_by_status(status_filter)
-            .map_err(|e| format!("Failed to count papers: {}", e))? as usize
     } else {
-        paper_repo.stats()
-            .map_err(|e| format!("Failed to get stats: {}", e))?.total
-    };
+        paper_repo.count()
+    }
+    .map_err(|e| format!("Failed to count papers: {}", e))? as usize;
 
     Ok(PapersResponse { total, papers })
 }
@@ -53,7 +60,7 @@ pub async fn get_paper(
     citekey: String,
     state: State<'_, AppState>,
 ) -> Result<Option<Paper>, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+    let db_guard = state.read_db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
     let paper_repo = PaperRepo::new(&db.conn);
@@ -66,7 +73,7 @@ pub async fn get_stats(
     vault_path: String,
     state: State<'_, AppState>,
 ) -> Result<VaultStats, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+    let db_guard = state.read_db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
     let paper_repo = PaperRepo::new(&db.conn);
@@ -82,8 +89,7 @@ pub async fn update_paper_status(
     state: State<'_, AppState>,
 ) -> Result<(), String> {
     // Validate status
-    let valid_statuses = ["discovered", "wanted", "queued", "downloaded", "summarized", "failed"];
-    if !valid_statuses.contains(&status.as_str()) {
+    if PaperStatus::from_str(&status).is_none() {
         return Err(format!("Invalid status: {}", status));
     }
 
@@ -104,7 +110,7 @@ pub async fn search_papers(
     query: String,
     state: State<'_, AppState>,
 ) -> Result<Vec<Paper>, String> {
-    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+    let db_guard = state.read_db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
     let paper_repo = PaperRepo::new(&db.conn);
@@ -138,15 +144,9 @@ pub async fn add_related_paper(
     let paper_repo = PaperRepo::new(&db.conn);
 
     // First, check if paper already exists by matching title or authors+year
+    // cited_by is derived from the citations table, so there is nothing to
+    // write back for an existing paper
     if let Some(existing_citekey) = find_existing_paper(&paper_repo, &request)? {
-        // Update the existing paper's cited_by if not already there
-        if let Ok(Some(mut paper)) = paper_repo.get(&existing_citekey) {
-            if !paper.cited_by.contains(&request.source_citekey) {
-                paper.cited_by.push(request.source_citekey.clone());
-                paper_repo.update(&paper)
-                    .map_err(|e| format!("Failed to update paper: {}", e))?;
-            }
-        }
         return Ok(AddRelatedPaperResponse {
             status: "exists".to_string(),
             citekey: existing_citekey,
@@ -217,7 +217,7 @@ fn find_existing_paper(repo: &PaperRepo, request: &AddRelatedPaperRequest) -> Re
         .unwrap_or_default();
 
     // Get all papers and check for duplicates
-    let papers = repo.get_all()
+    let papers = repo.get_all_shallow()
         .map_err(|e| format!("Failed to get papers: {}", e))?;
 
     for (citekey, paper) in &papers {
@@ -242,29 +242,6 @@ fn find_existing_paper(repo: &PaperRepo, request: &AddRelatedPaperRequest) -> Re
     Ok(None)
 }
 
-fn normalize_title(title: &str) -> String {
-    title.to_lowercase()
-        .chars()
-        .filter(|c| c.is_alphanumeric() || c.is_whitespace())
-        .collect::<String>()
-        .split_whitespace()
-        .collect::<Vec<_>>()
-        .join(" ")
-}
-
-fn normalize_author(author: &str) -> String {
-    // Extract last name, handling "Firstname Lastname" and "Lastname, Firstname"
-    let name = if author.contains(',') {
-        author.split(',').next().unwrap_or(author).trim()
-    } else {
-        author.split_whitespace().last().unwrap_or(author)
-    };
-    name.to_lowercase()
-        .chars()
-        .filter(|c| c.is_alphanumeric())
-        .collect()
-}
-
 fn titles_match(t1: &str, t2: &str) -> bool {
     // Check if titles are similar enough (one contains significant part of other)
     if t1 == t2 {
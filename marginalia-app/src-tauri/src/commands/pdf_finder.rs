@@ -2,15 +2,20 @@
 //!
 //! Uses adapters to search for and download open access PDFs from multiple sources.
 
-use crate::adapters::{ArxivClient, ClaudeCliClient, FileSystemAdapter, SemanticScholarClient, UnpaywallClient};
-use crate::models::PaperStatus;
-use crate::storage::PaperRepo;
+use crate::adapters::{
+    ArxivClient, ClaudeCliClient, FileSystemAdapter, OpenAlexClient, SemanticScholarClient, UnpaywallClient,
+};
+use crate::models::{Paper, PaperStatus};
+use crate::storage::pdf_lookup_repo::{claude_lookup_key, lookup_key};
+use crate::storage::{PaperRepo, PdfLookupRepo};
 use crate::AppState;
-use chrono::Utc;
-use reqwest::Client;
-use std::time::Duration;
+use crate::utils::http::shared_client;
+use chrono::{DateTime, Duration, Utc};
 use tauri::{AppHandle, Emitter, State};
-use tracing::{info, warn};
+use tracing::{debug, info, warn};
+
+/// How long a cached "no PDF found" result suppresses re-querying the sources
+const NEGATIVE_LOOKUP_TTL_DAYS: i64 = 7;
 
 /// Progress event for PDF search operations
 #[derive(Clone, serde::Serialize)]
@@ -57,120 +62,137 @@ pub async fn find_pdf(
     // Emit initial progress
     emit_progress(&app, &citekey, 0, None, "Starting PDF search...");
 
-    // Get paper from database
-    let paper = {
+    // Get paper and any cached lookup results from database
+    let (paper, lookup_key, cached, claude_cached) = {
         let db_guard = state.db.lock().map_err(|e| e.to_string())?;
         let db = db_guard.as_ref().ok_or("No vault is open")?;
         let paper_repo = PaperRepo::new(&db.conn);
-        paper_repo
+        let paper = paper_repo
             .get(&citekey)
             .map_err(|e| format!("Failed to get paper: {}", e))?
-            .ok_or_else(|| format!("Paper not found: {}", citekey))?
+            .ok_or_else(|| format!("Paper not found: {}", citekey))?;
+
+        let key = lookup_key(paper.doi.as_deref(), &paper.title);
+        let lookup_repo = PdfLookupRepo::new(&db.conn);
+        let cached = lookup_repo
+            .get(&key)
+            .map_err(|e| format!("Failed to get cached lookup: {}", e))?;
+        let claude_cached = lookup_repo
+            .get(&claude_lookup_key(&key))
+            .map_err(|e| format!("Failed to get cached lookup: {}", e))?;
+        (paper, key, cached, claude_cached)
     };
 
-    // Create shared HTTP client
-    let http_client = Client::builder()
-        .timeout(Duration::from_secs(30))
-        .build()
-        .map_err(|e| format!("Failed to create HTTP client: {}", e))?;
+    // Reuse the process-wide HTTP client so connections stay pooled
+    let http_client = shared_client();
 
     // Initialize adapters with shared client
+    let openalex = OpenAlexClient::with_client(http_client.clone(), None);
     let unpaywall = UnpaywallClient::with_client(http_client.clone(), None);
     let semantic_scholar = SemanticScholarClient::with_client(http_client.clone(), None);
     let arxiv = ArxivClient::with_client(http_client.clone());
     let claude_cli = ClaudeCliClient::new();
-    let filesystem = FileSystemAdapter::with_client(http_client.clone());
-
-    // Try different sources
-    let mut pdf_url: Option<(String, String)> = None;
 
-    // 1. Try arXiv first (if DOI contains arXiv or looks like an arXiv ID)
-    emit_progress(&app, &citekey, 10, Some("arxiv"), "Checking arXiv...");
-    if let Some(doi) = &paper.doi {
-        if let Some(url) = arxiv.find_pdf_by_doi(doi).await {
-            pdf_url = Some((url, "arxiv".to_string()));
+    // 0. Cached result: reuse a known URL, or skip the sources after a recent miss
+    let mut query_sources = true;
+    if let Some(lookup) = cached {
+        match lookup.pdf_url {
+            Some(url) => {
+                let source = lookup.source.unwrap_or_else(|| "cache".to_string());
+                if let Some(result) =
+                    download_found_pdf(&app, &state, &vault_path, &paper, &lookup_key, &url, &source).await?
+                {
+                    return Ok(result);
+                }
+                // The cached URL no longer serves a PDF; ask the sources for a fresh one
+            }
+            None => query_sources = miss_expired(lookup.checked_at),
         }
     }
+    // A recent "NONE" from Claude means asking again would just spend tokens
+    let ask_claude = claude_cached.map_or(true, |lookup| miss_expired(lookup.checked_at));
 
-    // 2. Try Unpaywall (if DOI exists)
-    if pdf_url.is_none() {
-        emit_progress(&app, &citekey, 25, Some("unpaywall"), "Checking Unpaywall...");
+    // Try different sources. Each stage queries independent hosts concurrently
+    // (each has its own rate limiter); within a stage, earlier sources win.
+    // A miss is only definitive if every source queried actually answered.
+    let mut pdf_url: Option<(String, String)> = None;
+    let mut definitive = true;
+
+    // 1. DOI lookups: OpenAlex alone first, since it merges Unpaywall, Crossref
+    //    and repository records; then arXiv, Unpaywall, Semantic Scholar together
+    if query_sources {
         if let Some(doi) = &paper.doi {
-            if let Some(url) = unpaywall.find_pdf_by_doi(doi).await {
-                pdf_url = Some((url, "unpaywall".to_string()));
-            }
+            emit_progress(&app, &citekey, 5, Some("openalex"), "Checking OpenAlex...");
+            let openalex_url = openalex.find_pdf_by_doi(doi).await;
+            pdf_url = first_found(vec![("openalex", openalex_url)], &mut definitive);
         }
     }
 
-    // 3. Try Semantic Scholar by DOI
-    if pdf_url.is_none() {
-        emit_progress(&app, &citekey, 40, Some("semantic_scholar"), "Checking Semantic Scholar (DOI)...");
+    if pdf_url.is_none() && query_sources {
         if let Some(doi) = &paper.doi {
-            if let Some(url) = semantic_scholar.find_pdf_by_doi(doi).await {
-                pdf_url = Some((url, "semantic_scholar".to_string()));
-            }
+            emit_progress(&app, &citekey, 10, None, "Checking arXiv, Unpaywall and Semantic Scholar...");
+            let (arxiv_url, unpaywall_url, s2_url) = tokio::join!(
+                arxiv.find_pdf_by_doi(doi),
+                unpaywall.find_pdf_by_doi(doi),
+                semantic_scholar.find_pdf_by_doi(doi),
+            );
+            pdf_url = first_found(
+                vec![("arxiv", arxiv_url), ("unpaywall", unpaywall_url), ("semantic_scholar", s2_url)],
+                &mut definitive,
+            );
         }
     }
 
-    // 4. Try Semantic Scholar by title
-    if pdf_url.is_none() {
-        emit_progress(&app, &citekey, 55, Some("semantic_scholar"), "Checking Semantic Scholar (title)...");
-        if let Some(url) = semantic_scholar.find_pdf_by_title(&paper.title).await {
-            pdf_url = Some((url, "semantic_scholar".to_string()));
-        }
+    // 2. Title lookups: Semantic Scholar, OpenAlex, then arXiv (for preprints without DOIs)
+    if pdf_url.is_none() && query_sources {
+        emit_progress(&app, &citekey, 50, None, "Searching Semantic Scholar, OpenAlex and arXiv by title...");
+        let (s2_url, openalex_url, arxiv_url) = tokio::join!(
+            semantic_scholar.find_pdf_by_title(&paper.title),
+            openalex.find_pdf_by_title(&paper.title),
+            arxiv.find_pdf_by_title(&paper.title),
+        );
+        pdf_url = first_found(
+            vec![("semantic_scholar", s2_url), ("openalex", openalex_url), ("arxiv", arxiv_url)],
+            &mut definitive,
+        );
     }
 
-    // 5. Try arXiv by title (for preprints that may not have DOIs)
-    if pdf_url.is_none() {
-        emit_progress(&app, &citekey, 70, Some("arxiv"), "Checking arXiv (title)...");
-        if let Some(url) = arxiv.find_pdf_by_title(&paper.title).await {
-            pdf_url = Some((url, "arxiv".to_string()));
-        }
+    // Cache a miss from the API sources so repeat searches skip them for a
+    // while, but only if every source said it has no PDF; a failed or skipped
+    // source might have had one
+    if pdf_url.is_none() && query_sources && definitive {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
+        PdfLookupRepo::new(&db.conn)
+            .record(&lookup_key, None, None)
+            .map_err(|e| format!("Failed to cache lookup: {}", e))?;
     }
 
-    // 6. Try Claude CLI (if available)
-    if pdf_url.is_none() && ClaudeCliClient::is_available() {
+    // 3. Try Claude CLI (if available) as a last resort: it is slow and costs
+    //    tokens, so it only runs once every API source has missed
+    if pdf_url.is_none() && ask_claude && ClaudeCliClient::is_available() {
         emit_progress(&app, &citekey, 85, Some("claude"), "Asking Claude for PDF URL...");
-        if let Some(url) = claude_cli.find_pdf_url(&paper).await {
-            pdf_url = Some((url, "claude".to_string()));
+        match claude_cli.find_pdf_url(&paper).await {
+            Ok(Some(url)) => pdf_url = Some((url, "claude".to_string())),
+            Ok(None) => {
+                // Claude looked and said there is none: don't re-run the CLI
+                // for this paper until the miss expires
+                let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+                let db = db_guard.as_ref().ok_or("No vault is open")?;
+                PdfLookupRepo::new(&db.conn)
+                    .record(&claude_lookup_key(&lookup_key), None, Some("claude"))
+                    .map_err(|e| format!("Failed to cache lookup: {}", e))?;
+            }
+            Err(e) => warn!("Claude PDF search failed: {}", e),
         }
     }
 
     // If we found a URL, download the PDF
     if let Some((url, source)) = pdf_url {
-        emit_progress(&app, &citekey, 90, Some(&source), &format!("Downloading from {}...", source));
-        match filesystem.download_pdf(&vault_path, &citekey, &url).await {
-            Ok(path) => {
-                // Update paper status in database
-                {
-                    let db_guard = state.db.lock().map_err(|e| e.to_string())?;
-                    let db = db_guard.as_ref().ok_or("No vault is open")?;
-                    let paper_repo = PaperRepo::new(&db.conn);
-
-                    let mut updated_paper = paper.clone();
-                    updated_paper.status = PaperStatus::Downloaded;
-                    updated_paper.pdf_path = Some(path.clone());
-                    updated_paper.downloaded_at = Some(Utc::now());
-
-                    paper_repo
-                        .update(&updated_paper)
-                        .map_err(|e| format!("Failed to update paper: {}", e))?;
-                }
-
-                info!("Found PDF for {} from {}", citekey, source);
-                emit_progress(&app, &citekey, 100, Some(&source), "PDF downloaded successfully!");
-
-                return Ok(FindPdfResult {
-                    success: true,
-                    pdf_path: Some(path),
-                    source: Some(source),
-                    manual_links: Vec::new(),
-                    error: None,
-                });
-            }
-            Err(e) => {
-                warn!("Failed to download from {}: {}", url, e);
-            }
+        if let Some(result) =
+            download_found_pdf(&app, &state, &vault_path, &paper, &lookup_key, &url, &source).await?
+        {
+            return Ok(result);
         }
     }
 
@@ -204,6 +226,101 @@ pub async fn find_pdf(
     })
 }
 
+/// Whether a cached miss is old enough to ask the sources again
+fn miss_expired(checked_at: DateTime<Utc>) -> bool {
+    Utc::now() - checked_at > Duration::days(NEGATIVE_LOOKUP_TTL_DAYS)
+}
+
+/// Pick the highest-priority URL from one stage's results
+///
+/// Results are in priority order. Any source that failed clears
+/// `definitive`, since its "no PDF" is unknown rather than an answer.
+fn first_found(
+    results: Vec<(&str, Result<Option<String>, String>)>,
+    definitive: &mut bool,
+) -> Option<(String, String)> {
+    let mut found = None;
+    for (source, result) in results {
+        match result {
+            Ok(Some(url)) => {
+                if found.is_none() {
+                    found = Some((url, source.to_string()));
+                }
+            }
+            Ok(None) => {}
+            Err(e) => {
+                debug!("{} lookup inconclusive: {}", source, e);
+                *definitive = false;
+            }
+        }
+    }
+    found
+}
+
+/// Download a found PDF, then mark the paper downloaded and cache the URL
+///
+/// Returns `None` if the download fails, after forgetting the cached URL so
+/// it isn't offered again.
+async fn download_found_pdf(
+    app: &AppHandle,
+    state: &AppState,
+    vault_path: &str,
+    paper: &Paper,
+    lookup_key: &str,
+    url: &str,
+    source: &str,
+) -> Result<Option<FindPdfResult>, String> {
+    let citekey = &paper.citekey;
+    emit_progress(app, citekey, 90, Some(source), &format!("Downloading from {}...", source));
+
+    let filesystem = FileSystemAdapter::with_client(shared_client());
+    let path = match filesystem.download_pdf(vault_path, citekey, url).await {
+        Ok(path) => path,
+        Err(e) => {
+            warn!("Failed to download from {}: {}", url, e);
+
+            // Don't offer a URL that no longer serves a PDF next time
+            let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+            let db = db_guard.as_ref().ok_or("No vault is open")?;
+            PdfLookupRepo::new(&db.conn)
+                .remove(lookup_key)
+                .map_err(|e| format!("Failed to clear cached lookup: {}", e))?;
+            return Ok(None);
+        }
+    };
+
+    // Update paper status in database
+    {
+        let db_guard = state.db.lock().map_err(|e| e.to_string())?;
+        let db = db_guard.as_ref().ok_or("No vault is open")?;
+        let paper_repo = PaperRepo::new(&db.conn);
+
+        let mut updated_paper = paper.clone();
+        updated_paper.status = PaperStatus::Downloaded;
+        updated_paper.pdf_path = Some(path.clone());
+        updated_paper.downloaded_at = Some(Utc::now());
+
+        paper_repo
+            .update(&updated_paper)
+            .map_err(|e| format!("Failed to update paper: {}", e))?;
+
+        PdfLookupRepo::new(&db.conn)
+            .record(lookup_key, Some(url), Some(source))
+            .map_err(|e| format!("Failed to cache lookup: {}", e))?;
+    }
+
+    info!("Found PDF for {} from {}", citekey, source);
+    emit_progress(app, citekey, 100, Some(source), "PDF downloaded successfully!");
+
+    Ok(Some(FindPdfResult {
+        success: true,
+        pdf_path: Some(path),
+        source: Some(source.to_string()),
+        manual_links: Vec::new(),
+        error: None,
+    }))
+}
+
 /// Generate manual search links for a paper
 fn generate_search_links(title: &str, authors: &[String], doi: Option<&str>) -> Vec<String> {
     let mut links = Vec::new();
@@ -253,7 +370,7 @@ pub async fn download_pdf(
     url: String,
     state: State<'_, AppState>,
 ) -> Result<String, String> {
-    let filesystem = FileSystemAdapter::new()?;
+    let filesystem = FileSystemAdapter::with_client(shared_client());
 
     let path = filesystem.download_pdf(&vault_path, &citekey, &url).await?;
 
@@ -1,3 +1,4 @@
+use crate::adapters::filesystem::write_atomic;
 use crate::models::AppSettings;
 use std::path::PathBuf;
 use std::fs;
@@ -35,7 +36,8 @@ pub async fn save_settings(settings: AppSettings) -> Result<(), String> {
     let content = serde_json::to_string_pretty(&settings)
         .map_err(|e| format!("Failed to serialize settings: {}", e))?;
 
-    fs::write(&settings_path, content)
+    write_atomic(&settings_path, content)
+        .await
         .map_err(|e| format!("Failed to write settings: {}", e))?;
 
     Ok(())
@@ -2,13 +2,14 @@
 //!
 //! Handles opening, creating, and managing vaults with SQLite storage.
 
-use std::path::PathBuf;
+use std::path::{Path, PathBuf};
 use std::fs;
 use tauri::State;
 use tracing::{info, warn};
 
+use crate::adapters::filesystem::write_atomic;
 use crate::models::{VaultIndex, VaultStats, RecentVault, AppSettings, PaperStatus};
-use crate::storage::{open_database, Database, PaperRepo};
+use crate::storage::{open_database, open_read_connection, Database, PaperRepo};
 use crate::AppState;
 
 use chrono::Utc;
@@ -48,11 +49,18 @@ pub async fn open_vault(
         source_bib_path: None,
     };
 
+    let read_db = open_read_connection(&vault_path)
+        .map_err(|e| format!("Failed to open database: {}", e))?;
+
     // Store database in app state
     {
         let mut db_guard = state.db.lock().map_err(|e| e.to_string())?;
         *db_guard = Some(db);
     }
+    {
+        let mut read_guard = state.read_db.lock().map_err(|e| e.to_string())?;
+        *read_guard = Some(read_db);
+    }
     {
         let mut path_guard = state.vault_path.lock().map_err(|e| e.to_string())?;
         *path_guard = Some(vault_path);
@@ -84,11 +92,18 @@ pub async fn create_vault(
     let db = open_database(&vault_path)
         .map_err(|e| format!("Failed to create database: {}", e))?;
 
+    let read_db = open_read_connection(&vault_path)
+        .map_err(|e| format!("Failed to create database: {}", e))?;
+
     // Store in app state
     {
         let mut db_guard = state.db.lock().map_err(|e| e.to_string())?;
         *db_guard = Some(db);
     }
+    {
+        let mut read_guard = state.read_db.lock().map_err(|e| e.to_string())?;
+        *read_guard = Some(read_db);
+    }
     {
         let mut path_guard = state.vault_path.lock().map_err(|e| e.to_string())?;
         *path_guard = Some(vault_path);
@@ -129,7 +144,11 @@ pub async fn save_index(
     let db_guard = state.db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let paper_repo = PaperRepo::new(&db.conn);
+    // Write the whole index in one transaction rather than one commit per paper
+    let tx = db.conn.unchecked_transaction()
+        .map_err(|e| format!("Failed to start transaction: {}", e))?;
+
+    let paper_repo = PaperRepo::new(&tx);
 
     // Update each paper in the database
     for (_, paper) in &index.papers {
@@ -143,12 +162,15 @@ pub async fn save_index(
     }
 
     // Update connections
-    let conn_repo = crate::storage::ConnectionRepo::new(&db.conn);
+    let conn_repo = crate::storage::ConnectionRepo::new(&tx);
     for connection in &index.connections {
         conn_repo.add(&connection.source, &connection.target, &connection.reason)
             .map_err(|e| format!("Failed to save connection: {}", e))?;
     }
 
+    tx.commit()
+        .map_err(|e| format!("Failed to commit index: {}", e))?;
+
     info!("Saved index with {} papers to database", index.papers.len());
     Ok(())
 }
@@ -202,7 +224,8 @@ pub async fn add_recent_vault(path: String, paper_count: usize) -> Result<(), St
     // Save settings
     let content = serde_json::to_string_pretty(&settings)
         .map_err(|e| format!("Failed to serialize settings: {}", e))?;
-    fs::write(&settings_path, content)
+    write_atomic(&settings_path, content)
+        .await
         .map_err(|e| format!("Failed to write settings: {}", e))?;
 
     Ok(())
@@ -228,60 +251,64 @@ pub async fn scan_vault_files(
     path: String,
     state: State<'_, AppState>,
 ) -> Result<ScanResult, String> {
-    let vault_path = PathBuf::from(&path);
-    let papers_path = vault_path.join("papers");
+    let papers_path = PathBuf::from(&path).join("papers");
+
+    // Walk the papers directory before taking the database lock
+    let found = tokio::task::spawn_blocking(move || scan_paper_dirs(&papers_path))
+        .await
+        .map_err(|e| format!("Failed to scan vault files: {}", e))?;
 
     // Get the database
     let db_guard = state.db.lock().map_err(|e| e.to_string())?;
     let db = db_guard.as_ref().ok_or("No vault is open")?;
 
-    let paper_repo = PaperRepo::new(&db.conn);
     let mut updated = 0;
-
-    // Scan papers directory
-    if papers_path.exists() {
-        if let Ok(entries) = fs::read_dir(&papers_path) {
-            for entry in entries.flatten() {
-                let citekey = entry.file_name().to_string_lossy().to_string();
-                let paper_dir = entry.path();
-
-                if !paper_dir.is_dir() {
-                    continue;
+    {
+        let tx = db.conn.unchecked_transaction()
+            .map_err(|e| format!("Failed to start transaction: {}", e))?;
+        let paper_repo = PaperRepo::new(&tx);
+
+        let mut known = paper_repo.get_all_shallow()
+            .map_err(|e| format!("Failed to get papers: {}", e))?;
+
+        for files in found {
+            // Check if paper exists in database
+            let paper = match known.get_mut(&files.citekey) {
+                Some(paper) => paper,
+                None => continue,
+            };
+
+            let mut changed = false;
+
+            // Check for PDF
+            if files.has_pdf && paper.pdf_path.is_none() {
+                paper.pdf_path = Some(format!("papers/{}/paper.pdf", files.citekey));
+                if paper.status == PaperStatus::Discovered {
+                    paper.status = PaperStatus::Downloaded;
                 }
+                changed = true;
+            }
 
-                // Check if paper exists in database
-                if let Ok(Some(mut paper)) = paper_repo.get(&citekey) {
-                    let pdf_path = paper_dir.join("paper.pdf");
-                    let summary_path = paper_dir.join("summary.md");
-
-                    let mut changed = false;
-
-                    // Check for PDF
-                    if pdf_path.exists() && paper.pdf_path.is_none() {
-                        paper.pdf_path = Some(format!("papers/{}/paper.pdf", citekey));
-                        if paper.status == PaperStatus::Discovered {
-                            paper.status = PaperStatus::Downloaded;
-                        }
-                        changed = true;
-                    }
-
-                    // Check for summary
-                    if summary_path.exists() && paper.summary_path.is_none() {
-                        paper.summary_path = Some(format!("papers/{}/summary.md", citekey));
-                        paper.status = PaperStatus::Summarized;
-                        changed = true;
-                    }
-
-                    if changed {
-                        paper_repo.update(&paper)
-                            .map_err(|e| format!("Failed to update paper: {}", e))?;
-                        updated += 1;
-                    }
-                }
+            // Check for summary
+            if files.has_summary && paper.summary_path.is_none() {
+                paper.summary_path = Some(format!("papers/{}/summary.md", files.citekey));
+                paper.status = PaperStatus::Summarized;
+                changed = true;
+            }
+
+            if changed {
+                paper_repo.update(paper)
+                    .map_err(|e| format!("Failed to update paper: {}", e))?;
+                updated += 1;
             }
         }
+
+        tx.commit()
+            .map_err(|e| format!("Failed to commit scan: {}", e))?;
     }
 
+    let paper_repo = PaperRepo::new(&db.conn);
+
     // Get updated index
     let papers = paper_repo.get_all()
         .map_err(|e| format!("Failed to get papers: {}", e))?;
@@ -311,6 +338,34 @@ pub struct ScanResult {
     pub index: VaultIndex,
 }
 
+/// Files found in one paper directory under `papers/`
+struct PaperDirFiles {
+    citekey: String,
+    has_pdf: bool,
+    has_summary: bool,
+}
+
+/// List paper directories and which of paper.pdf / summary.md they contain
+fn scan_paper_dirs(papers_path: &Path) -> Vec<PaperDirFiles> {
+    let entries = match fs::read_dir(papers_path) {
+        Ok(entries) => entries,
+        Err(_) => return Vec::new(),
+    };
+
+    entries
+        .flatten()
+        .filter(|entry| entry.path().is_dir())
+        .map(|entry| {
+            let paper_dir = entry.path();
+            PaperDirFiles {
+                citekey: entry.file_name().to_string_lossy().to_string(),
+                has_pdf: paper_dir.join("paper.pdf").exists(),
+                has_summary: paper_dir.join("summary.md").exists(),
+            }
+        })
+        .collect()
+}
+
 /// Find .bib files in the vault root directory
 #[tauri::command]
 pub async fn find_bib_files(path: String) -> Result<Vec<String>, String> {
@@ -320,13 +375,10 @@ pub async fn find_bib_files(path: String) -> Result<Vec<String>, String> {
 
     if let Ok(entries) = fs::read_dir(&vault_path) {
         for entry in entries.flatten() {
+            // Check the extension first so only .bib entries cost a stat
             let file_path = entry.path();
-            if file_path.is_file() {
-                if let Some(ext) = file_path.extension() {
-                    if ext == "bib" {
-                        bib_files.push(file_path.to_string_lossy().to_string());
-                    }
-                }
+            if file_path.extension().map_or(false, |ext| ext == "bib") && file_path.is_file() {
+                bib_files.push(file_path.to_string_lossy().to_string());
             }
         }
     }
@@ -17,6 +17,9 @@ pub struct AppState {
     pub vault_path: Mutex<Option<PathBuf>>,
     /// Database connection for the current vault
     pub db: Mutex<Option<storage::Database>>,
+    /// Read-only connection for commands that only query, so they don't
+    /// queue behind long writes on `db`
+    pub read_db: Mutex<Option<storage::Database>>,
     /// Log directory path
     pub log_dir: PathBuf,
 }
@@ -26,6 +29,7 @@ impl AppState {
         Self {
             vault_path: Mutex::new(None),
             db: Mutex::new(None),
+            read_db: Mutex::new(None),
             log_dir,
         }
     }
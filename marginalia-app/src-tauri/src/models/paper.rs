@@ -18,6 +18,31 @@ impl Default for PaperStatus {
     }
 }
 
+impl PaperStatus {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            PaperStatus::Discovered => "discovered",
+            PaperStatus::Wanted => "wanted",
+            PaperStatus::Queued => "queued",
+            PaperStatus::Downloaded => "downloaded",
+            PaperStatus::Summarized => "summarized",
+            PaperStatus::Failed => "failed",
+        }
+    }
+
+    pub fn from_str(s: &str) -> Option<Self> {
+        match s {
+            "discovered" => Some(PaperStatus::Discovered),
+            "wanted" => Some(PaperStatus::Wanted),
+            "queued" => Some(PaperStatus::Queued),
+            "downloaded" => Some(PaperStatus::Downloaded),
+            "summarized" => Some(PaperStatus::Summarized),
+            "failed" => Some(PaperStatus::Failed),
+            _ => None,
+        }
+    }
+}
+
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct Citation {
     pub citekey: String,
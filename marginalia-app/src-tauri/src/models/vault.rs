@@ -46,15 +46,7 @@ impl VaultIndex {
     pub fn stats(&self) -> VaultStats {
         let mut by_status = HashMap::new();
         for paper in self.papers.values() {
-            let status_str = match paper.status {
-                super::paper::PaperStatus::Discovered => "discovered",
-                super::paper::PaperStatus::Wanted => "wanted",
-                super::paper::PaperStatus::Queued => "queued",
-                super::paper::PaperStatus::Downloaded => "downloaded",
-                super::paper::PaperStatus::Summarized => "summarized",
-                super::paper::PaperStatus::Failed => "failed",
-            };
-            *by_status.entry(status_str.to_string()).or_insert(0) += 1;
+            *by_status.entry(paper.status.as_str().to_string()).or_insert(0) += 1;
         }
 
         VaultStats {
@@ -5,11 +5,17 @@
 //! - Validating and parsing LLM responses
 //! - Converting validated output to markdown
 //! - Saving raw responses on parse failure
+//! - Reusing the parsed response when the same prompt is summarized again
 
 use crate::adapters::FileSystemAdapter;
 use crate::models::{Paper, RelatedPaper};
+use crate::utils::claude::claude_program;
+use crate::utils::text::truncate_at_boundary;
 use serde::{Deserialize, Serialize};
-use std::process::Command;
+use sha2::{Digest, Sha256};
+use std::fmt::Write as _;
+use std::time::Duration;
+use tokio::process::Command;
 use tracing::{debug, error, info, warn};
 
 /// Expected JSON output structure from Claude CLI
@@ -85,6 +91,9 @@ impl SummarizerService {
     /// Maximum number of retry attempts for JSON parse failures
     const MAX_RETRIES: u32 = 3;
 
+    /// Longest a single Claude CLI run may take before it is killed
+    const CLI_TIMEOUT: Duration = Duration::from_secs(300);
+
     /// Summarize a paper and return structured output
     ///
     /// This method:
@@ -93,23 +102,48 @@ impl SummarizerService {
     /// 3. On parse failure: retries up to MAX_RETRIES times with increasingly specific prompts
     /// 4. On success: converts to markdown and returns related papers
     /// 5. After all retries fail: saves raw response and returns error
+    ///
+    /// Unless `force` is set, a response cached for an identical prompt (same
+    /// paper metadata and PDF text) is reused instead of calling Claude again.
     pub async fn summarize(
         &self,
         vault_path: &str,
         paper: &Paper,
         text: &str,
+        force: bool,
     ) -> SummarizationResult {
         info!("Summarizing paper with JSON output: {}", paper.citekey);
 
+        let json_prompt = Self::build_json_prompt(paper, text);
+        let prompt_hash = format!("{:x}", Sha256::digest(json_prompt.as_bytes()));
+
+        if !force {
+            if let Some(cached) = self
+                .filesystem
+                .load_cached_response(vault_path, &paper.citekey, &prompt_hash)
+                .await
+            {
+                if let Ok(parsed) = serde_json::from_str::<ClaudeSummaryOutput>(&cached) {
+                    info!("Reusing cached summary response for {}", paper.citekey);
+                    return Self::success(paper, parsed);
+                }
+            }
+        }
+
         let mut last_response = String::new();
         let mut last_error = String::new();
 
+        // The first attempt borrows json_prompt rather than copying the full
+        // paper text again; retries build their own prompt here
+        let mut retry_prompt: String;
+
         for attempt in 1..=Self::MAX_RETRIES {
-            let prompt = if attempt == 1 {
-                Self::build_json_prompt(paper, text)
+            let prompt: &str = if attempt == 1 {
+                &json_prompt
             } else {
                 // On retry, use a more emphatic prompt about JSON format
-                Self::build_retry_prompt(paper, text, attempt, &last_error)
+                retry_prompt = Self::build_retry_prompt(paper, text, attempt, &last_error);
+                &retry_prompt
             };
 
             if attempt > 1 {
@@ -122,18 +156,26 @@ impl SummarizerService {
                 );
             }
 
-            // Call Claude CLI
-            let output = match Command::new("claude")
-                .args(["--print", "-p", &prompt])
-                .output()
-            {
-                Ok(o) => o,
-                Err(e) => {
+            // Call Claude CLI; on timeout the output future is dropped, which
+            // kills the child rather than leaving it running
+            let run = Command::new(claude_program())
+                .args(["--print", "-p", prompt])
+                .kill_on_drop(true)
+                .output();
+            let output = match tokio::time::timeout(Self::CLI_TIMEOUT, run).await {
+                Ok(Ok(o)) => o,
+                Ok(Err(e)) => {
                     return SummarizationResult::CliError(format!(
                         "Failed to run Claude CLI: {}",
                         e
                     ));
                 }
+                Err(_) => {
+                    return SummarizationResult::CliError(format!(
+                        "Claude CLI timed out after {}s",
+                        Self::CLI_TIMEOUT.as_secs()
+                    ));
+                }
             };
 
             if !output.status.success() {
@@ -152,7 +194,7 @@ impl SummarizerService {
             let json_str = Self::extract_json(&response);
 
             // Attempt to parse as structured output
-            match serde_json::from_str::<ClaudeSummaryOutput>(&json_str) {
+            match serde_json::from_str::<ClaudeSummaryOutput>(json_str) {
                 Ok(parsed) => {
                     if attempt > 1 {
                         info!(
@@ -166,14 +208,15 @@ impl SummarizerService {
                         );
                     }
 
-                    let markdown = Self::format_to_markdown(paper, &parsed);
-                    let related_papers: Vec<RelatedPaper> =
-                        parsed.related_work.into_iter().map(Into::into).collect();
+                    if let Err(e) = self
+                        .filesystem
+                        .save_cached_response(vault_path, &paper.citekey, &prompt_hash, json_str)
+                        .await
+                    {
+                        warn!("Failed to cache summary response for {}: {}", paper.citekey, e);
+                    }
 
-                    return SummarizationResult::Success {
-                        markdown,
-                        related_papers,
-                    };
+                    return Self::success(paper, parsed);
                 }
                 Err(parse_error) => {
                     warn!(
@@ -198,6 +241,7 @@ impl SummarizerService {
         match self
             .filesystem
             .save_raw_response(vault_path, &paper.citekey, &last_response)
+            .await
         {
             Ok(path) => SummarizationResult::ParseFailure {
                 raw_response_path: path,
@@ -218,6 +262,18 @@ impl SummarizerService {
         }
     }
 
+    /// Convert parsed output into a successful result
+    fn success(paper: &Paper, parsed: ClaudeSummaryOutput) -> SummarizationResult {
+        let markdown = Self::format_to_markdown(paper, &parsed);
+        let related_papers: Vec<RelatedPaper> =
+            parsed.related_work.into_iter().map(Into::into).collect();
+
+        SummarizationResult::Success {
+            markdown,
+            related_papers,
+        }
+    }
+
     /// Build prompt requesting JSON output
     fn build_json_prompt(paper: &Paper, text: &str) -> String {
         format!(
@@ -263,10 +319,12 @@ Paper text:
             2 => 50000,
             _ => 30000,
         };
-        let truncated_text = if text.len() > max_text_len {
-            format!("{}...\n[TEXT TRUNCATED]", &text[..max_text_len])
+        // Borrow the kept prefix instead of copying it into an intermediate
+        // string, cutting at a line or word break where one is close
+        let (kept_text, truncation_note) = if text.len() > max_text_len {
+            (truncate_at_boundary(text, max_text_len), "...\n[TEXT TRUNCATED]")
         } else {
-            text.to_string()
+            (text, "")
         };
 
         format!(
@@ -303,7 +361,7 @@ RULES:
 - Escape special characters in strings (newlines as \n, quotes as \")
 
 Paper text:
-{}"#,
+{}{}"#,
             previous_error,
             paper.title,
             paper.authors.join(", "),
@@ -311,34 +369,22 @@ Paper text:
                 .year
                 .map(|y| y.to_string())
                 .unwrap_or_else(|| "n.d.".to_string()),
-            truncated_text
+            kept_text,
+            truncation_note
         )
     }
 
     /// Extract JSON from a response that might have extra text
-    fn extract_json(response: &str) -> String {
+    ///
+    /// Returns a slice of the response, so the (often tens of KB) JSON is not
+    /// copied before parsing.
+    fn extract_json(response: &str) -> &str {
         let trimmed = response.trim();
 
         // If it starts with {, assume it's pure JSON
         if trimmed.starts_with('{') {
-            // Find matching closing brace
-            let mut depth = 0;
-            let mut end_pos = 0;
-            for (i, c) in trimmed.char_indices() {
-                match c {
-                    '{' => depth += 1,
-                    '}' => {
-                        depth -= 1;
-                        if depth == 0 {
-                            end_pos = i + 1;
-                            break;
-                        }
-                    }
-                    _ => {}
-                }
-            }
-            if end_pos > 0 {
-                return trimmed[..end_pos].to_string();
+            if let Some(object) = Self::balanced_object(trimmed) {
+                return object;
             }
         }
 
@@ -346,7 +392,7 @@ Paper text:
         if let Some(start) = trimmed.find("```json") {
             let json_start = start + 7;
             if let Some(end) = trimmed[json_start..].find("```") {
-                return trimmed[json_start..json_start + end].trim().to_string();
+                return trimmed[json_start..json_start + end].trim();
             }
         }
 
@@ -359,15 +405,57 @@ Paper text:
                 if let Some(newline) = content.find('\n') {
                     let after_lang = &content[newline + 1..];
                     if after_lang.trim().starts_with('{') {
-                        return after_lang.trim().to_string();
+                        return after_lang.trim();
                     }
                 }
-                return content.to_string();
+                return content;
             }
         }
 
+        // Try the first balanced object in surrounding prose
+        if let Some(object) = trimmed.find('{').and_then(|start| Self::balanced_object(&trimmed[start..])) {
+            return object;
+        }
+
         // Return as-is if no special handling needed
-        trimmed.to_string()
+        trimmed
+    }
+
+    /// Return the leading `{...}` object of `text`, which must start with `{`
+    ///
+    /// Braces inside JSON strings (e.g. a summary quoting `{x}`) are skipped,
+    /// so they don't end the object early and force a retry.
+    fn balanced_object(text: &str) -> Option<&str> {
+        let mut depth = 0usize;
+        let mut in_string = false;
+        let mut escaped = false;
+
+        // Braces, quotes and backslashes are ASCII, so scanning bytes is safe
+        for (i, b) in text.bytes().enumerate() {
+            if in_string {
+                match b {
+                    _ if escaped => escaped = false,
+                    b'\\' => escaped = true,
+                    b'"' => in_string = false,
+                    _ => {}
+                }
+                continue;
+            }
+
+            match b {
+                b'"' => in_string = true,
+                b'{' => depth += 1,
+                b'}' => {
+                    depth = depth.checked_sub(1)?;
+                    if depth == 0 {
+                        return Some(&text[..=i]);
+                    }
+                }
+                _ => {}
+            }
+        }
+
+        None
     }
 
     /// Format parsed output to markdown with frontmatter
@@ -399,34 +487,35 @@ status: "summarized"
             output.summary
         );
 
+        // Format straight into the buffer; writing to a String cannot fail
         for contrib in &output.key_contributions {
-            md.push_str(&format!("- {}\n", contrib));
+            let _ = writeln!(md, "- {}", contrib);
         }
 
         if let Some(methodology) = &output.methodology {
-            md.push_str(&format!("\n## Methodology\n\n{}\n", methodology));
+            let _ = writeln!(md, "\n## Methodology\n\n{}", methodology);
         }
 
         md.push_str("\n## Main Results\n\n");
         for result in &output.main_results {
-            md.push_str(&format!("- {}\n", result));
+            let _ = writeln!(md, "- {}", result);
         }
 
         if let Some(limitations) = &output.limitations {
-            md.push_str(&format!("\n## Limitations\n\n{}\n", limitations));
+            let _ = writeln!(md, "\n## Limitations\n\n{}", limitations);
         }
 
         if !output.related_work.is_empty() {
             md.push_str("\n## Related Work\n\n");
             for related in &output.related_work {
-                md.push_str(&format!("- **{}**", related.title));
+                let _ = write!(md, "- **{}**", related.title);
                 if !related.authors.is_empty() {
-                    md.push_str(&format!(" by {}", related.authors.join(", ")));
+                    let _ = write!(md, " by {}", related.authors.join(", "));
                 }
                 if let Some(year) = related.year {
-                    md.push_str(&format!(" ({})", year));
+                    let _ = write!(md, " ({})", year);
                 }
-                md.push_str(&format!("\n  - {}\n", related.why_related));
+                let _ = writeln!(md, "\n  - {}", related.why_related);
             }
         }
 
@@ -462,6 +551,20 @@ mod tests {
         assert!(result.starts_with('{'));
     }
 
+    #[test]
+    fn test_extract_json_ignores_braces_in_strings() {
+        let input = r#"{"summary": "uses sets {x} and a \"}\" quote", "key_contributions": []} trailing"#;
+        let result = SummarizerService::extract_json(input);
+        assert_eq!(result, r#"{"summary": "uses sets {x} and a \"}\" quote", "key_contributions": []}"#);
+    }
+
+    #[test]
+    fn test_extract_json_in_prose() {
+        let input = r#"Here is the summary: {"summary": "test", "key_contributions": []} Hope this helps!"#;
+        let result = SummarizerService::extract_json(input);
+        assert_eq!(result, r#"{"summary": "test", "key_contributions": []}"#);
+    }
+
     #[test]
     fn test_parse_valid_output() {
         let json = r#"{
@@ -522,4 +625,15 @@ mod tests {
         assert!(prompt.contains("[TEXT TRUNCATED]"));
         assert!(prompt.len() < 35000); // Some overhead for the prompt template
     }
+
+    #[test]
+    fn test_retry_prompt_truncates_on_char_boundary() {
+        let paper = Paper::new("test2024".to_string(), "Test Paper".to_string());
+
+        // Each 'é' is two bytes, so byte 30000 falls mid-character
+        let long_text = format!("a{}", "é".repeat(20000));
+        let prompt = SummarizerService::build_retry_prompt(&paper, &long_text, 3, "error");
+
+        assert!(prompt.ends_with("...\n[TEXT TRUNCATED]"));
+    }
 }
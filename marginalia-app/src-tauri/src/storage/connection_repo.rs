@@ -101,6 +101,29 @@ impl<'a> ConnectionRepo<'a> {
         Ok(count > 0)
     }
 
+    /// Check if two papers are connected in either direction
+    pub fn exists_between(&self, a: &str, b: &str) -> Result<bool, DatabaseError> {
+        let exists: bool = self.conn.query_row(
+            "SELECT EXISTS(
+                SELECT 1 FROM connections
+                WHERE (source = ?1 AND target = ?2) OR (source = ?2 AND target = ?1)
+             )",
+            params![a, b],
+            |row| row.get(0),
+        )?;
+        Ok(exists)
+    }
+
+    /// Remove the connection between two papers in either direction
+    pub fn remove_between(&self, a: &str, b: &str) -> Result<usize, DatabaseError> {
+        let count = self.conn.execute(
+            "DELETE FROM connections
+             WHERE (source = ?1 AND target = ?2) OR (source = ?2 AND target = ?1)",
+            params![a, b],
+        )?;
+        Ok(count)
+    }
+
     /// Get neighbors of a paper (directly connected papers)
     pub fn get_neighbors(&self, citekey: &str) -> Result<Vec<String>, DatabaseError> {
         let mut stmt = self.conn.prepare(
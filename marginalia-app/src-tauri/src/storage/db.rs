@@ -1,14 +1,21 @@
 //! Database connection management and migrations
 
-use rusqlite::{Connection, params};
+use rusqlite::{Connection, OpenFlags, params};
 use std::path::{Path, PathBuf};
 use std::fs;
+use std::time::Duration;
 use tracing::{info, warn, error};
 
 use crate::models::vault::VaultIndex;
-use crate::models::paper::{Paper, PaperStatus, Citation, RelatedPaper};
+use crate::models::paper::{Paper, Citation, RelatedPaper};
 use crate::models::notes::{PaperNotes, Highlight};
 
+/// How long a statement waits for a lock held by another connection
+///
+/// WAL readers can still hit SQLITE_BUSY briefly (WAL recovery, or a restart
+/// or truncate checkpoint by the writer); waiting avoids failing the command.
+const BUSY_TIMEOUT: Duration = Duration::from_secs(5);
+
 /// Database error type
 #[derive(Debug)]
 pub enum DatabaseError {
@@ -84,6 +91,16 @@ pub fn open_database(vault_path: &Path) -> Result<Database, DatabaseError> {
     conn.execute("PRAGMA foreign_keys = ON", [])
         .map_err(|e| DatabaseError::MigrationFailed(format!("Failed to enable foreign keys: {}", e)))?;
 
+    // Wait out brief locks instead of failing with SQLITE_BUSY
+    conn.busy_timeout(BUSY_TIMEOUT)
+        .map_err(|e| DatabaseError::ConnectionFailed(format!("Failed to set busy timeout: {}", e)))?;
+
+    // Use write-ahead logging: per-paper updates append to the WAL instead of
+    // rewriting pages through a rollback journal, and readers don't block
+    // behind writers. NORMAL sync is durable across app crashes in WAL mode.
+    conn.execute_batch("PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;")
+        .map_err(|e| DatabaseError::ConnectionFailed(format!("Failed to enable WAL: {}", e)))?;
+
     // Run migrations
     run_migrations(&conn)?;
 
@@ -101,8 +118,29 @@ pub fn open_database(vault_path: &Path) -> Result<Database, DatabaseError> {
     Ok(db)
 }
 
+/// Open a read-only connection to a vault database that `open_database` has already set up
+///
+/// In WAL mode readers don't wait for the writer, so listing and search
+/// commands use this connection and keep responding while an import or
+/// bulk save holds the main one.
+pub fn open_read_connection(vault_path: &Path) -> Result<Database, DatabaseError> {
+    let conn = Connection::open_with_flags(
+        Database::db_path(vault_path),
+        OpenFlags::SQLITE_OPEN_READ_ONLY | OpenFlags::SQLITE_OPEN_NO_MUTEX,
+    )
+    .map_err(|e| DatabaseError::ConnectionFailed(e.to_string()))?;
+
+    conn.busy_timeout(BUSY_TIMEOUT)
+        .map_err(|e| DatabaseError::ConnectionFailed(format!("Failed to set busy timeout: {}", e)))?;
+
+    Ok(Database {
+        conn,
+        vault_path: vault_path.to_path_buf(),
+    })
+}
+
 /// Run database schema migrations
-fn run_migrations(conn: &Connection) -> Result<(), DatabaseError> {
+pub(crate) fn run_migrations(conn: &Connection) -> Result<(), DatabaseError> {
     // Get current schema version
     let current_version: i32 = conn
         .query_row(
@@ -126,6 +164,24 @@ fn run_migrations(conn: &Connection) -> Result<(), DatabaseError> {
         apply_v2_schema(conn)?;
     }
 
+    // v3: Indexes for paginated listing
+    if current_version < 3 {
+        info!("Applying migration v3: Listing indexes");
+        apply_v3_schema(conn)?;
+    }
+
+    // v4: Full-text search index
+    if current_version < 4 {
+        info!("Applying migration v4: Full-text search");
+        apply_v4_schema(conn)?;
+    }
+
+    // v5: PDF lookup cache
+    if current_version < 5 {
+        info!("Applying migration v5: PDF lookup cache");
+        apply_v5_schema(conn)?;
+    }
+
     Ok(())
 }
 
@@ -143,6 +199,27 @@ fn apply_v2_schema(conn: &Connection) -> Result<(), DatabaseError> {
     Ok(())
 }
 
+/// Apply v3 schema: Indexes for paginated listing
+fn apply_v3_schema(conn: &Connection) -> Result<(), DatabaseError> {
+    conn.execute_batch(include_str!("migration_v3.sql"))
+        .map_err(|e| DatabaseError::MigrationFailed(format!("Failed to apply v3 schema: {}", e)))?;
+    Ok(())
+}
+
+/// Apply v4 schema: Full-text search index
+fn apply_v4_schema(conn: &Connection) -> Result<(), DatabaseError> {
+    conn.execute_batch(include_str!("migration_v4.sql"))
+        .map_err(|e| DatabaseError::MigrationFailed(format!("Failed to apply v4 schema: {}", e)))?;
+    Ok(())
+}
+
+/// Apply v5 schema: PDF lookup cache
+fn apply_v5_schema(conn: &Connection) -> Result<(), DatabaseError> {
+    conn.execute_batch(include_str!("migration_v5.sql"))
+        .map_err(|e| DatabaseError::MigrationFailed(format!("Failed to apply v5 schema: {}", e)))?;
+    Ok(())
+}
+
 /// Migrate data from JSON index to SQLite
 fn migrate_from_json(db: &Database, json_path: &Path) -> Result<(), DatabaseError> {
     info!("Reading JSON index from {:?}", json_path);
@@ -189,14 +266,7 @@ fn migrate_from_json(db: &Database, json_path: &Path) -> Result<(), DatabaseErro
 
 /// Import a single paper into the database
 fn import_paper(db: &Database, paper: &Paper) -> Result<(), DatabaseError> {
-    let status_str = match paper.status {
-        PaperStatus::Discovered => "discovered",
-        PaperStatus::Wanted => "wanted",
-        PaperStatus::Queued => "queued",
-        PaperStatus::Downloaded => "downloaded",
-        PaperStatus::Summarized => "summarized",
-        PaperStatus::Failed => "failed",
-    };
+    let status_str = paper.status.as_str();
 
     let authors_json = serde_json::to_string(&paper.authors)?;
     let manual_links_json = serde_json::to_string(&paper.manual_download_links)?;
@@ -0,0 +1,10 @@
+-- Migration v3: Indexes for paginated paper listing
+-- Papers are listed newest-first, optionally filtered by status. Without an
+-- index on added_at every page sorts the whole table; these let SQLite walk
+-- the rows already in order and stop after LIMIT.
+
+CREATE INDEX IF NOT EXISTS idx_papers_added_at ON papers(added_at DESC);
+CREATE INDEX IF NOT EXISTS idx_papers_status_added_at ON papers(status, added_at DESC);
+
+-- Update schema version
+INSERT INTO schema_version (version) VALUES (3);
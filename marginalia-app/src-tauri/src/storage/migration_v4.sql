@@ -0,0 +1,40 @@
+-- Migration v4: Full-text search index for papers
+-- Search used to run LIKE '%q%' over title, authors, abstract and citekey,
+-- which scans every row and cannot rank results. An external-content FTS5
+-- table indexes the same columns without duplicating the text; triggers keep
+-- it in sync with the papers table and bm25() orders matches by relevance.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    citekey,
+    title,
+    authors_json,
+    abstract,
+    content='papers',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, citekey, title, authors_json, abstract)
+    VALUES (new.rowid, new.citekey, new.title, new.authors_json, new.abstract);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, citekey, title, authors_json, abstract)
+    VALUES ('delete', old.rowid, old.citekey, old.title, old.authors_json, old.abstract);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_update
+AFTER UPDATE OF citekey, title, authors_json, abstract ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, citekey, title, authors_json, abstract)
+    VALUES ('delete', old.rowid, old.citekey, old.title, old.authors_json, old.abstract);
+    INSERT INTO papers_fts (rowid, citekey, title, authors_json, abstract)
+    VALUES (new.rowid, new.citekey, new.title, new.authors_json, new.abstract);
+END;
+
+-- Index papers that existed before this migration
+INSERT INTO papers_fts (papers_fts) VALUES ('rebuild');
+
+-- Update schema version
+INSERT INTO schema_version (version) VALUES (4);
@@ -0,0 +1,14 @@
+-- Migration v5: PDF lookup cache
+-- Remembers the outcome of open-access PDF lookups, keyed by DOI (or by
+-- normalized title when a paper has no DOI). A NULL pdf_url records that no
+-- source had a PDF, so repeated searches skip the network until it expires.
+
+CREATE TABLE IF NOT EXISTS pdf_lookups (
+    lookup_key TEXT PRIMARY KEY,
+    pdf_url TEXT,
+    source TEXT,
+    checked_at TEXT NOT NULL
+);
+
+-- Update schema version
+INSERT INTO schema_version (version) VALUES (5);
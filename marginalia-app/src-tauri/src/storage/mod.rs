@@ -12,11 +12,13 @@ pub mod connection_repo;
 pub mod notes_repo;
 pub mod job_repo;
 pub mod project_repo;
+pub mod pdf_lookup_repo;
 
-pub use db::{Database, open_database, DatabaseError};
+pub use db::{Database, open_database, open_read_connection, DatabaseError};
 pub use paper_repo::PaperRepo;
 pub use citation_repo::CitationRepo;
 pub use connection_repo::ConnectionRepo;
 pub use notes_repo::NotesRepo;
 pub use job_repo::JobRepo;
 pub use project_repo::ProjectRepo;
+pub use pdf_lookup_repo::{PdfLookup, PdfLookupRepo};
@@ -1,13 +1,16 @@
 //! Paper repository for database operations on papers
 
-use rusqlite::{params, Connection, Row};
+use rusqlite::{params, params_from_iter, Connection, Row};
 use chrono::{DateTime, Utc};
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
 
 use crate::models::paper::{Paper, PaperStatus, Citation, RelatedPaper};
 use crate::models::vault::VaultStats;
 use super::DatabaseError;
 
+/// Upper bound on citekeys bound into a single `IN (...)` clause
+const MAX_BOUND_CITEKEYS: usize = 500;
+
 /// Repository for Paper operations
 pub struct PaperRepo<'a> {
     conn: &'a Connection,
@@ -57,11 +60,7 @@ impl<'a> PaperRepo<'a> {
             )?;
             let rows = stmt.query_map(params![s, limit, offset], |row| self.row_to_paper(row))?;
             for row in rows {
-                let mut paper = row?;
-                paper.citations = self.get_citations(&paper.citekey).unwrap_or_default();
-                paper.related_papers = self.get_related_papers(&paper.citekey).unwrap_or_default();
-                paper.cited_by = self.get_cited_by(&paper.citekey).unwrap_or_default();
-                papers.push(paper);
+                papers.push(row?);
             }
         } else {
             let mut stmt = self.conn.prepare(
@@ -69,29 +68,45 @@ impl<'a> PaperRepo<'a> {
             )?;
             let rows = stmt.query_map(params![limit, offset], |row| self.row_to_paper(row))?;
             for row in rows {
-                let mut paper = row?;
-                paper.citations = self.get_citations(&paper.citekey).unwrap_or_default();
-                paper.related_papers = self.get_related_papers(&paper.citekey).unwrap_or_default();
-                paper.cited_by = self.get_cited_by(&paper.citekey).unwrap_or_default();
-                papers.push(paper);
+                papers.push(row?);
             }
         }
 
+        self.attach_relations(&mut papers, false)?;
+
         Ok(papers)
     }
 
     /// Get all papers as a HashMap (for compatibility with existing code)
     pub fn get_all(&self) -> Result<HashMap<String, Paper>, DatabaseError> {
+        let mut papers = self.select_all()?;
+        self.attach_relations(&mut papers, true)?;
+
+        Ok(papers
+            .into_iter()
+            .map(|paper| (paper.citekey.clone(), paper))
+            .collect())
+    }
+
+    /// Get all papers without citations, related papers, or cited-by lists
+    ///
+    /// For callers that only look at a paper's own columns, such as
+    /// duplicate detection by title and author.
+    pub fn get_all_shallow(&self) -> Result<HashMap<String, Paper>, DatabaseError> {
+        Ok(self
+            .select_all()?
+            .into_iter()
+            .map(|paper| (paper.citekey.clone(), paper))
+            .collect())
+    }
+
+    fn select_all(&self) -> Result<Vec<Paper>, DatabaseError> {
         let mut stmt = self.conn.prepare("SELECT * FROM papers")?;
         let rows = stmt.query_map([], |row| self.row_to_paper(row))?;
 
-        let mut papers = HashMap::new();
+        let mut papers = Vec::new();
         for row in rows {
-            let mut paper = row?;
-            paper.citations = self.get_citations(&paper.citekey).unwrap_or_default();
-            paper.related_papers = self.get_related_papers(&paper.citekey).unwrap_or_default();
-            paper.cited_by = self.get_cited_by(&paper.citekey).unwrap_or_default();
-            papers.insert(paper.citekey.clone(), paper);
+            papers.push(row?);
         }
 
         Ok(papers)
@@ -99,7 +114,7 @@ impl<'a> PaperRepo<'a> {
 
     /// Insert a new paper
     pub fn insert(&self, paper: &Paper) -> Result<(), DatabaseError> {
-        let status_str = status_to_string(&paper.status);
+        let status_str = paper.status.as_str();
         let authors_json = serde_json::to_string(&paper.authors)?;
         let manual_links_json = serde_json::to_string(&paper.manual_download_links)?;
 
@@ -150,7 +165,7 @@ impl<'a> PaperRepo<'a> {
 
     /// Update an existing paper
     pub fn update(&self, paper: &Paper) -> Result<(), DatabaseError> {
-        let status_str = status_to_string(&paper.status);
+        let status_str = paper.status.as_str();
         let authors_json = serde_json::to_string(&paper.authors)?;
         let manual_links_json = serde_json::to_string(&paper.manual_download_links)?;
 
@@ -189,6 +204,72 @@ impl<'a> PaperRepo<'a> {
         Ok(())
     }
 
+    /// Merge imported papers (e.g. from a .bib file) into the vault
+    ///
+    /// New citekeys are inserted. Existing papers still in `Discovered`
+    /// status get their bibliographic fields refreshed; papers that have
+    /// moved on (downloaded, summarized, ...) are left untouched, so their
+    /// status and file paths survive a re-import. A citekey repeated within
+    /// `papers` refreshes the copy inserted earlier. Callers should wrap
+    /// this in a transaction.
+    ///
+    /// # Returns
+    /// * `(added, updated)` - Number of papers inserted and refreshed
+    pub fn import_papers(&self, papers: &[Paper]) -> Result<(usize, usize), DatabaseError> {
+        // Look up existing citekeys once instead of querying per entry
+        let mut existing = self.citekeys()?;
+
+        let mut added = 0;
+        let mut updated = 0;
+
+        for paper in papers {
+            if existing.contains(&paper.citekey) {
+                if self.refresh_discovered(paper)? {
+                    updated += 1;
+                }
+            } else {
+                self.insert(paper)?;
+                existing.insert(paper.citekey.clone());
+                added += 1;
+            }
+        }
+
+        Ok((added, updated))
+    }
+
+    /// Update a paper's bibliographic fields if it is still `Discovered`
+    ///
+    /// # Returns
+    /// * `true` if the paper was refreshed, `false` if it doesn't exist or
+    ///   has moved past `Discovered`
+    fn refresh_discovered(&self, paper: &Paper) -> Result<bool, DatabaseError> {
+        let authors_json = serde_json::to_string(&paper.authors)?;
+
+        let mut stmt = self.conn.prepare_cached(
+            "UPDATE papers SET
+                title = ?, authors_json = ?, year = ?, journal = ?, volume = ?,
+                number = ?, pages = ?, doi = ?, url = ?, abstract = ?,
+                updated_at = datetime('now')
+            WHERE citekey = ? AND status = ?",
+        )?;
+        let rows = stmt.execute(params![
+            paper.title,
+            authors_json,
+            paper.year,
+            paper.journal,
+            paper.volume,
+            paper.number,
+            paper.pages,
+            paper.doi,
+            paper.url,
+            paper.r#abstract,
+            paper.citekey,
+            PaperStatus::Discovered.as_str(),
+        ])?;
+
+        Ok(rows > 0)
+    }
+
     /// Update only the status of a paper
     pub fn update_status(&self, citekey: &str, status: &str) -> Result<(), DatabaseError> {
         self.conn.execute(
@@ -198,8 +279,39 @@ impl<'a> PaperRepo<'a> {
         Ok(())
     }
 
-    /// Search papers by title, authors, or abstract
+    /// Search papers by title, authors, abstract, or citekey
+    ///
+    /// Each word in the query is matched as a prefix against the full-text
+    /// index and results are ordered by bm25 relevance, with title and
+    /// citekey hits weighted above authors and abstract.
     pub fn search(&self, query: &str) -> Result<Vec<Paper>, DatabaseError> {
+        let fts_query = match fts_query(query) {
+            Some(q) => q,
+            None => return self.search_like(query),
+        };
+
+        let mut stmt = self.conn.prepare(
+            "SELECT papers.* FROM papers_fts
+             JOIN papers ON papers.rowid = papers_fts.rowid
+             WHERE papers_fts MATCH ?
+             ORDER BY bm25(papers_fts, 10.0, 10.0, 5.0, 1.0)
+             LIMIT 100"
+        )?;
+
+        let rows = stmt.query_map([&fts_query], |row| self.row_to_paper(row))?;
+
+        let mut papers = Vec::new();
+        for row in rows {
+            papers.push(row?);
+        }
+
+        self.attach_relations(&mut papers, false)?;
+
+        Ok(papers)
+    }
+
+    /// Substring search for queries with no indexable words (e.g. punctuation)
+    fn search_like(&self, query: &str) -> Result<Vec<Paper>, DatabaseError> {
         let search_pattern = format!("%{}%", query.to_lowercase());
 
         let mut stmt = self.conn.prepare(
@@ -219,24 +331,16 @@ impl<'a> PaperRepo<'a> {
 
         let mut papers = Vec::new();
         for row in rows {
-            let mut paper = row?;
-            paper.citations = self.get_citations(&paper.citekey).unwrap_or_default();
-            paper.related_papers = self.get_related_papers(&paper.citekey).unwrap_or_default();
-            paper.cited_by = self.get_cited_by(&paper.citekey).unwrap_or_default();
-            papers.push(paper);
+            papers.push(row?);
         }
 
+        self.attach_relations(&mut papers, false)?;
+
         Ok(papers)
     }
 
     /// Get vault statistics
     pub fn stats(&self) -> Result<VaultStats, DatabaseError> {
-        let total: usize = self.conn.query_row(
-            "SELECT COUNT(*) FROM papers",
-            [],
-            |row| row.get(0),
-        )?;
-
         let mut stmt = self.conn.prepare(
             "SELECT status, COUNT(*) FROM papers GROUP BY status"
         )?;
@@ -248,8 +352,11 @@ impl<'a> PaperRepo<'a> {
             Ok((status, count))
         })?;
 
+        // The grouped counts cover every row, so the total falls out of them
+        let mut total: usize = 0;
         for row in rows {
             let (status, count) = row?;
+            total += count as usize;
             by_status.insert(status, count);
         }
 
@@ -276,6 +383,32 @@ impl<'a> PaperRepo<'a> {
         Ok(count > 0)
     }
 
+    /// Get the citekeys of all papers
+    ///
+    /// One query for bulk operations that would otherwise call `exists`
+    /// once per paper.
+    pub fn citekeys(&self) -> Result<HashSet<String>, DatabaseError> {
+        let mut stmt = self.conn.prepare("SELECT citekey FROM papers")?;
+        let rows = stmt.query_map([], |row| row.get::<_, String>(0))?;
+
+        let mut citekeys = HashSet::new();
+        for row in rows {
+            citekeys.insert(row?);
+        }
+
+        Ok(citekeys)
+    }
+
+    /// Count all papers
+    pub fn count(&self) -> Result<i64, DatabaseError> {
+        let count: i64 = self.conn.query_row(
+            "SELECT COUNT(*) FROM papers",
+            [],
+            |row| row.get(0),
+        )?;
+        Ok(count)
+    }
+
     /// Count papers by status
     pub fn count_by_status(&self, status: &str) -> Result<i64, DatabaseError> {
         let count: i64 = self.conn.query_row(
@@ -290,7 +423,7 @@ impl<'a> PaperRepo<'a> {
 
     fn row_to_paper(&self, row: &Row) -> rusqlite::Result<Paper> {
         let status_str: String = row.get("status")?;
-        let status = string_to_status(&status_str);
+        let status = PaperStatus::from_str(&status_str).unwrap_or_default();
 
         let authors_json: String = row.get("authors_json")?;
         let authors: Vec<String> = serde_json::from_str(&authors_json).unwrap_or_default();
@@ -341,6 +474,106 @@ impl<'a> PaperRepo<'a> {
         })
     }
 
+    /// Load citations, related papers, and cited-by lists for a batch of papers
+    ///
+    /// Runs three queries for the whole batch instead of three per paper, then
+    /// hands each paper its rows from a map keyed by citekey. With
+    /// `whole_table` the queries scan every row (used by `get_all`); otherwise
+    /// they are restricted to the batch's citekeys. Batches too large to bind as
+    /// parameters fall back to the whole-table scan.
+    fn attach_relations(&self, papers: &mut [Paper], whole_table: bool) -> Result<(), DatabaseError> {
+        if papers.is_empty() {
+            return Ok(());
+        }
+        let whole_table = whole_table || papers.len() > MAX_BOUND_CITEKEYS;
+
+        let citekeys: Vec<String> = if whole_table {
+            Vec::new()
+        } else {
+            papers.iter().map(|p| p.citekey.clone()).collect()
+        };
+        let filter = |column: &str| {
+            if whole_table {
+                String::new()
+            } else {
+                format!(" WHERE {} IN ({})", column, vec!["?"; citekeys.len()].join(", "))
+            }
+        };
+
+        let mut citations: HashMap<String, Vec<Citation>> = HashMap::new();
+        {
+            let mut stmt = self.conn.prepare(&format!(
+                "SELECT source_citekey, citekey, title, authors, year, doi, status FROM citations{}",
+                filter("source_citekey")
+            ))?;
+            let rows = stmt.query_map(params_from_iter(citekeys.iter()), |row| {
+                Ok((
+                    row.get::<_, String>(0)?,
+                    Citation {
+                        citekey: row.get(1)?,
+                        title: row.get(2)?,
+                        authors: row.get(3)?,
+                        year: row.get(4)?,
+                        doi: row.get(5)?,
+                        status: row.get(6)?,
+                    },
+                ))
+            })?;
+            // Skip malformed rows rather than failing the whole batch
+            for (source, citation) in rows.flatten() {
+                citations.entry(source).or_default().push(citation);
+            }
+        }
+
+        let mut related: HashMap<String, Vec<RelatedPaper>> = HashMap::new();
+        {
+            let mut stmt = self.conn.prepare(&format!(
+                "SELECT source_citekey, title, authors_json, year, why_related, vault_citekey FROM related_papers{}",
+                filter("source_citekey")
+            ))?;
+            let rows = stmt.query_map(params_from_iter(citekeys.iter()), |row| {
+                let authors_json: String = row.get(2)?;
+                let authors: Vec<String> = serde_json::from_str(&authors_json).unwrap_or_default();
+
+                Ok((
+                    row.get::<_, String>(0)?,
+                    RelatedPaper {
+                        title: row.get(1)?,
+                        authors,
+                        year: row.get(3)?,
+                        why_related: row.get(4)?,
+                        vault_citekey: row.get(5)?,
+                    },
+                ))
+            })?;
+            for (source, paper) in rows.flatten() {
+                related.entry(source).or_default().push(paper);
+            }
+        }
+
+        let mut cited_by: HashMap<String, Vec<String>> = HashMap::new();
+        {
+            let mut stmt = self.conn.prepare(&format!(
+                "SELECT citekey, source_citekey FROM citations{}",
+                filter("citekey")
+            ))?;
+            let rows = stmt.query_map(params_from_iter(citekeys.iter()), |row| {
+                Ok((row.get::<_, String>(0)?, row.get::<_, String>(1)?))
+            })?;
+            for (citekey, source) in rows.flatten() {
+                cited_by.entry(citekey).or_default().push(source);
+            }
+        }
+
+        for paper in papers.iter_mut() {
+            paper.citations = citations.remove(&paper.citekey).unwrap_or_default();
+            paper.related_papers = related.remove(&paper.citekey).unwrap_or_default();
+            paper.cited_by = cited_by.remove(&paper.citekey).unwrap_or_default();
+        }
+
+        Ok(())
+    }
+
     fn get_citations(&self, citekey: &str) -> Result<Vec<Citation>, DatabaseError> {
         let mut stmt = self.conn.prepare(
             "SELECT citekey, title, authors, year, doi, status
@@ -473,27 +706,91 @@ impl<'a> PaperRepo<'a> {
     }
 }
 
-// Helper functions for status conversion
-
-fn status_to_string(status: &PaperStatus) -> &'static str {
-    match status {
-        PaperStatus::Discovered => "discovered",
-        PaperStatus::Wanted => "wanted",
-        PaperStatus::Queued => "queued",
-        PaperStatus::Downloaded => "downloaded",
-        PaperStatus::Summarized => "summarized",
-        PaperStatus::Failed => "failed",
+/// Build an FTS5 MATCH expression from free-form user input
+///
+/// Splits on anything that is not alphanumeric and quotes each word as a
+/// prefix term, so user input can never be parsed as FTS5 query syntax.
+/// Returns None when the input contains no words.
+fn fts_query(input: &str) -> Option<String> {
+    let terms: Vec<String> = input
+        .split(|c: char| !c.is_alphanumeric())
+        .filter(|word| !word.is_empty())
+        .map(|word| format!("\"{}\"*", word))
+        .collect();
+
+    if terms.is_empty() {
+        None
+    } else {
+        Some(terms.join(" "))
     }
 }
 
-fn string_to_status(s: &str) -> PaperStatus {
-    match s {
-        "discovered" => PaperStatus::Discovered,
-        "wanted" => PaperStatus::Wanted,
-        "queued" => PaperStatus::Queued,
-        "downloaded" => PaperStatus::Downloaded,
-        "summarized" => PaperStatus::Summarized,
-        "failed" => PaperStatus::Failed,
-        _ => PaperStatus::Discovered,
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::storage::db::run_migrations;
+
+    fn test_conn() -> Connection {
+        let conn = Connection::open_in_memory().unwrap();
+        run_migrations(&conn).unwrap();
+        conn
+    }
+
+    #[test]
+    fn test_import_papers_keeps_progress() {
+        let conn = test_conn();
+        let repo = PaperRepo::new(&conn);
+
+        let mut downloaded = Paper::new("smith2020".to_string(), "Old Title".to_string());
+        downloaded.status = PaperStatus::Downloaded;
+        downloaded.pdf_path = Some("pdfs/smith2020.pdf".to_string());
+        repo.insert(&downloaded).unwrap();
+
+        let mut summarized = Paper::new("doe2021".to_string(), "Old Title".to_string());
+        summarized.status = PaperStatus::Summarized;
+        summarized.pdf_path = Some("pdfs/doe2021.pdf".to_string());
+        summarized.summary_path = Some("summaries/doe2021.md".to_string());
+        repo.insert(&summarized).unwrap();
+
+        repo.insert(&Paper::new("lee2019".to_string(), "Old Title".to_string()))
+            .unwrap();
+
+        let imported = vec![
+            Paper::new("smith2020".to_string(), "New Title".to_string()),
+            Paper::new("doe2021".to_string(), "New Title".to_string()),
+            Paper::new("lee2019".to_string(), "New Title".to_string()),
+        ];
+        assert_eq!(repo.import_papers(&imported).unwrap(), (0, 1));
+
+        // Papers past Discovered are left exactly as they were
+        let paper = repo.get("smith2020").unwrap().unwrap();
+        assert_eq!(paper.status, PaperStatus::Downloaded);
+        assert_eq!(paper.pdf_path.as_deref(), Some("pdfs/smith2020.pdf"));
+        assert_eq!(paper.title, "Old Title");
+
+        let paper = repo.get("doe2021").unwrap().unwrap();
+        assert_eq!(paper.status, PaperStatus::Summarized);
+        assert_eq!(paper.pdf_path.as_deref(), Some("pdfs/doe2021.pdf"));
+        assert_eq!(paper.summary_path.as_deref(), Some("summaries/doe2021.md"));
+        assert_eq!(paper.title, "Old Title");
+
+        // A Discovered paper gets the refreshed metadata
+        let paper = repo.get("lee2019").unwrap().unwrap();
+        assert_eq!(paper.status, PaperStatus::Discovered);
+        assert_eq!(paper.title, "New Title");
+    }
+
+    #[test]
+    fn test_import_papers_repeated_citekey() {
+        let conn = test_conn();
+        let repo = PaperRepo::new(&conn);
+
+        let imported = vec![
+            Paper::new("smith2020".to_string(), "First Copy".to_string()),
+            Paper::new("smith2020".to_string(), "Second Copy".to_string()),
+        ];
+        assert_eq!(repo.import_papers(&imported).unwrap(), (1, 1));
+        assert_eq!(repo.count().unwrap(), 1);
+        assert_eq!(repo.get("smith2020").unwrap().unwrap().title, "Second Copy");
     }
 }
@@ -0,0 +1,114 @@
+//! PDF lookup repository for caching open-access source results
+
+use rusqlite::{params, Connection};
+use chrono::{DateTime, Utc};
+
+use super::DatabaseError;
+use crate::utils::text::normalize_title;
+
+/// Cached outcome of a PDF lookup
+#[derive(Debug, Clone)]
+pub struct PdfLookup {
+    /// PDF URL found, or `None` if no source had one
+    pub pdf_url: Option<String>,
+    /// Source that provided the URL (e.g., "arxiv", "unpaywall", "claude")
+    pub source: Option<String>,
+    pub checked_at: DateTime<Utc>,
+}
+
+/// Build the cache key for a paper: its DOI, or its normalized title if it has none
+pub fn lookup_key(doi: Option<&str>, title: &str) -> String {
+    match doi.map(str::trim).filter(|d| !d.is_empty()) {
+        Some(doi) => format!("doi:{}", doi.to_lowercase()),
+        None => format!("title:{}", normalize_title(title)),
+    }
+}
+
+/// Build the cache key for the Claude CLI's answer about a paper
+///
+/// Claude's misses live in their own row, so asking it doesn't reset the
+/// expiry of the API sources' miss and vice versa.
+pub fn claude_lookup_key(key: &str) -> String {
+    format!("claude:{}", key)
+}
+
+/// Repository for PDF lookup cache operations
+pub struct PdfLookupRepo<'a> {
+    conn: &'a Connection,
+}
+
+impl<'a> PdfLookupRepo<'a> {
+    pub fn new(conn: &'a Connection) -> Self {
+        Self { conn }
+    }
+
+    /// Get the cached lookup for a key
+    pub fn get(&self, key: &str) -> Result<Option<PdfLookup>, DatabaseError> {
+        let result = self.conn.query_row(
+            "SELECT pdf_url, source, checked_at FROM pdf_lookups WHERE lookup_key = ?",
+            params![key],
+            |row| {
+                let checked_at_str: String = row.get(2)?;
+                let checked_at = DateTime::parse_from_rfc3339(&checked_at_str)
+                    .map(|d| d.with_timezone(&Utc))
+                    .unwrap_or_else(|_| Utc::now());
+
+                Ok(PdfLookup {
+                    pdf_url: row.get(0)?,
+                    source: row.get(1)?,
+                    checked_at,
+                })
+            },
+        );
+
+        match result {
+            Ok(lookup) => Ok(Some(lookup)),
+            Err(rusqlite::Error::QueryReturnedNoRows) => Ok(None),
+            Err(e) => Err(DatabaseError::from(e)),
+        }
+    }
+
+    /// Record a lookup outcome; pass `None` as the URL to cache a miss
+    pub fn record(&self, key: &str, pdf_url: Option<&str>, source: Option<&str>) -> Result<(), DatabaseError> {
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pdf_lookups (lookup_key, pdf_url, source, checked_at)
+             VALUES (?, ?, ?, ?)",
+            params![key, pdf_url, source, Utc::now().to_rfc3339()],
+        )?;
+        Ok(())
+    }
+
+    /// Forget a cached lookup
+    pub fn remove(&self, key: &str) -> Result<bool, DatabaseError> {
+        let rows = self.conn.execute(
+            "DELETE FROM pdf_lookups WHERE lookup_key = ?",
+            params![key],
+        )?;
+        Ok(rows > 0)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_lookup_key_prefers_doi() {
+        assert_eq!(lookup_key(Some(" 10.1257/AER.123 "), "Any Title"), "doi:10.1257/aer.123");
+    }
+
+    #[test]
+    fn test_lookup_key_normalizes_title() {
+        assert_eq!(
+            lookup_key(None, "The  Economics of: Information!"),
+            "title:the economics of information"
+        );
+        assert_eq!(lookup_key(Some(""), "A Title"), "title:a title");
+    }
+
+    #[test]
+    fn test_claude_lookup_key_is_separate() {
+        let key = lookup_key(Some("10.1257/aer.123"), "Any Title");
+        assert_eq!(claude_lookup_key(&key), "claude:doi:10.1257/aer.123");
+    }
+}
@@ -1,17 +1,54 @@
+use once_cell::sync::OnceCell;
+use std::path::{Path, PathBuf};
 use std::process::Command;
 
-/// Check if Claude CLI is available in the system PATH
-pub fn is_claude_available() -> bool {
-    Command::new("claude")
+/// Path of the Claude CLI binary, cached once a working one is found
+static CLAUDE_BINARY: OnceCell<PathBuf> = OnceCell::new();
+
+/// Locate a working Claude CLI binary on the system PATH
+///
+/// The first successful lookup (a PATH search plus `claude --version`) is
+/// cached, so later availability checks don't spawn a process. A failed
+/// lookup is not cached, so installing the CLI while the app is running is
+/// still picked up.
+pub fn claude_binary() -> Option<&'static Path> {
+    if let Some(path) = CLAUDE_BINARY.get() {
+        return Some(path);
+    }
+
+    let paths = std::env::var_os("PATH")?;
+    let path = std::env::split_paths(&paths)
+        .map(|dir| dir.join("claude"))
+        .find(|candidate| candidate.is_file())?;
+
+    let works = Command::new(&path)
         .arg("--version")
         .output()
         .map(|o| o.status.success())
-        .unwrap_or(false)
+        .unwrap_or(false);
+    if !works {
+        return None;
+    }
+
+    Some(CLAUDE_BINARY.get_or_init(|| path).as_path())
+}
+
+/// Program to run for Claude CLI commands
+///
+/// The resolved binary if there is one, otherwise plain `claude` so the
+/// spawn error reports the missing CLI as before.
+pub fn claude_program() -> &'static Path {
+    claude_binary().unwrap_or_else(|| Path::new("claude"))
+}
+
+/// Check if Claude CLI is available in the system PATH
+pub fn is_claude_available() -> bool {
+    claude_binary().is_some()
 }
 
 /// Get the version string of Claude CLI if available
 pub fn get_claude_version() -> Option<String> {
-    Command::new("claude")
+    Command::new(claude_program())
         .arg("--version")
         .output()
         .ok()
@@ -2,7 +2,11 @@
 //!
 //! Provides exponential backoff, rate limiting, and PDF validation for HTTP requests.
 
-use std::collections::HashMap;
+use once_cell::sync::Lazy;
+use reqwest::Client;
+use std::collections::hash_map::RandomState;
+use std::collections::{HashMap, VecDeque};
+use std::hash::{BuildHasher, Hasher};
 use std::sync::Arc;
 use std::time::{Duration, Instant};
 use tokio::sync::Mutex;
@@ -11,14 +15,51 @@ use tracing::{debug, warn};
 /// PDF magic bytes: "%PDF-"
 const PDF_MAGIC: &[u8] = b"%PDF-";
 
+/// Marker used by `status_error` to carry a server-requested delay
+const RETRY_AFTER_MARKER: &str = "(retry after ";
+
+/// Default timeout for requests made with the shared client
+const SHARED_CLIENT_TIMEOUT_SECS: u64 = 30;
+
+/// Time allowed to establish a connection (DNS + TCP + TLS)
+const SHARED_CLIENT_CONNECT_TIMEOUT_SECS: u64 = 10;
+
+/// Idle connections kept open per host in the shared pool
+const SHARED_CLIENT_MAX_IDLE_PER_HOST: usize = 10;
+
+/// How long an idle pooled connection is kept before being closed
+const SHARED_CLIENT_POOL_IDLE_TIMEOUT_SECS: u64 = 60;
+
+/// Process-wide HTTP client
+///
+/// reqwest clients own their connection pool, so building one per command
+/// throws away keep-alive connections and repeats the TLS handshake for every
+/// lookup. All commands share this client instead.
+static SHARED_CLIENT: Lazy<Client> = Lazy::new(|| {
+    Client::builder()
+        .timeout(Duration::from_secs(SHARED_CLIENT_TIMEOUT_SECS))
+        .connect_timeout(Duration::from_secs(SHARED_CLIENT_CONNECT_TIMEOUT_SECS))
+        .pool_max_idle_per_host(SHARED_CLIENT_MAX_IDLE_PER_HOST)
+        .pool_idle_timeout(Duration::from_secs(SHARED_CLIENT_POOL_IDLE_TIMEOUT_SECS))
+        .build()
+        .expect("Failed to create shared HTTP client")
+});
+
+/// Get a handle to the shared HTTP client
+///
+/// Cloning a reqwest `Client` is cheap and shares the underlying pool.
+pub fn shared_client() -> Client {
+    SHARED_CLIENT.clone()
+}
+
 /// Rate limiter for API endpoints
 pub struct RateLimiter {
     /// Window size in seconds
     window_secs: u64,
     /// Maximum requests per window
     max_requests: u32,
-    /// Request timestamps per endpoint
-    requests: Arc<Mutex<HashMap<String, Vec<Instant>>>>,
+    /// Request timestamps per endpoint, oldest first
+    requests: Arc<Mutex<HashMap<String, VecDeque<Instant>>>>,
 }
 
 impl RateLimiter {
@@ -44,14 +85,35 @@ impl RateLimiter {
     /// * `true` if request is allowed
     /// * `false` if rate limit exceeded
     pub async fn check_and_record(&self, endpoint: &str) -> bool {
+        self.try_record(endpoint).await.is_none()
+    }
+
+    /// Wait until a request can be made (blocking rate limiter)
+    ///
+    /// Sleeps until the oldest request in the window expires rather than
+    /// polling, so a waiting caller wakes exactly when a slot opens.
+    ///
+    /// # Arguments
+    /// * `endpoint` - The endpoint identifier
+    pub async fn wait_for_slot(&self, endpoint: &str) {
+        while let Some(wait) = self.try_record(endpoint).await {
+            tokio::time::sleep(wait).await;
+        }
+    }
+
+    /// Record a request if the window has room, otherwise return how long
+    /// until the oldest request leaves the window
+    async fn try_record(&self, endpoint: &str) -> Option<Duration> {
         let mut requests = self.requests.lock().await;
         let now = Instant::now();
         let window = Duration::from_secs(self.window_secs);
 
-        let timestamps = requests.entry(endpoint.to_string()).or_insert_with(Vec::new);
+        let timestamps = requests.entry(endpoint.to_string()).or_insert_with(VecDeque::new);
 
-        // Remove timestamps outside the window
-        timestamps.retain(|t| now.duration_since(*t) < window);
+        // Timestamps are recorded in order, so expired ones are at the front
+        while timestamps.front().map_or(false, |t| now.duration_since(*t) >= window) {
+            timestamps.pop_front();
+        }
 
         if timestamps.len() >= self.max_requests as usize {
             debug!(
@@ -60,25 +122,12 @@ impl RateLimiter {
                 timestamps.len(),
                 self.window_secs
             );
-            return false;
+            let oldest = *timestamps.front()?;
+            return Some(window.saturating_sub(now.duration_since(oldest)));
         }
 
-        timestamps.push(now);
-        true
-    }
-
-    /// Wait until a request can be made (blocking rate limiter)
-    ///
-    /// # Arguments
-    /// * `endpoint` - The endpoint identifier
-    pub async fn wait_for_slot(&self, endpoint: &str) {
-        loop {
-            if self.check_and_record(endpoint).await {
-                return;
-            }
-            // Wait a bit before checking again
-            tokio::time::sleep(Duration::from_millis(100)).await;
-        }
+        timestamps.push_back(now);
+        None
     }
 
     /// Get the time until next available slot
@@ -190,7 +239,10 @@ where
             }
             Err(e) => {
                 if attempt < config.max_retries && should_retry(&e) {
-                    let backoff = config.backoff_for_attempt(attempt);
+                    // Honor a server-requested delay; otherwise spread retries out
+                    let backoff = retry_after_from_error(&e.to_string())
+                        .map(|delay| delay.min(config.max_backoff))
+                        .unwrap_or_else(|| with_jitter(config.backoff_for_attempt(attempt)));
                     warn!(
                         "{} failed (attempt {}): {}. Retrying in {:?}",
                         operation_name,
@@ -211,6 +263,135 @@ where
     Err(last_error.expect("retry loop should have returned"))
 }
 
+/// Build the error message for a non-success HTTP response
+///
+/// Produces `"{prefix}: {status}"`, so retry predicates can keep matching on
+/// e.g. `"status: 5"`, and appends the `Retry-After` delay (in seconds) when
+/// the server sent one, for `with_retry` to honor.
+pub fn status_error(prefix: &str, resp: &reqwest::Response) -> String {
+    let retry_after = resp
+        .headers()
+        .get(reqwest::header::RETRY_AFTER)
+        .and_then(|v| v.to_str().ok())
+        .and_then(|v| v.trim().parse::<u64>().ok());
+
+    match retry_after {
+        Some(secs) => format!("{}: {} {}{}s)", prefix, resp.status(), RETRY_AFTER_MARKER, secs),
+        None => format!("{}: {}", prefix, resp.status()),
+    }
+}
+
+/// Extract the delay recorded by `status_error`, if any
+fn retry_after_from_error(message: &str) -> Option<Duration> {
+    let start = message.find(RETRY_AFTER_MARKER)? + RETRY_AFTER_MARKER.len();
+    let rest = &message[start..];
+    let secs = rest[..rest.find("s)")?].parse::<u64>().ok()?;
+    Some(Duration::from_secs(secs))
+}
+
+/// Scale a backoff to a random point in [50%, 100%] of its value so that
+/// requests failing together do not retry in lockstep
+fn with_jitter(backoff: Duration) -> Duration {
+    // Each RandomState is freshly keyed, which is enough randomness for jitter
+    let random = RandomState::new().build_hasher().finish();
+    backoff.mul_f64(0.5 + (random % 1000) as f64 / 2000.0)
+}
+
+/// Whether an error from an API request is worth retrying: network failures,
+/// server errors and rate limiting, as opposed to e.g. a 404 for an unknown DOI
+pub fn is_transient_error(err: &str) -> bool {
+    err.contains("request failed") || err.contains("status: 5") || err.contains("status: 429")
+}
+
+/// Whether an API request failed because the source doesn't know the item
+///
+/// A 404 from a lookup by identifier is a definitive answer ("no record"),
+/// unlike a network or server error.
+pub fn is_not_found(err: &str) -> bool {
+    err.contains("status: 404")
+}
+
+/// Circuit breaker for an external source
+///
+/// After `failure_threshold` consecutive transient failures the circuit opens
+/// and callers skip the source for `cooldown`, instead of each paying the full
+/// timeout and retry cost against a service that is down. Once the cooldown
+/// passes the circuit is half-open: a single probe request is let through
+/// while other callers keep skipping the source. A failed probe reopens the
+/// circuit immediately, a successful one closes it.
+pub struct CircuitBreaker {
+    name: &'static str,
+    failure_threshold: u32,
+    cooldown: Duration,
+    state: std::sync::Mutex<BreakerState>,
+}
+
+#[derive(Default)]
+struct BreakerState {
+    consecutive_failures: u32,
+    open_until: Option<Instant>,
+}
+
+impl CircuitBreaker {
+    /// Create a new circuit breaker
+    ///
+    /// # Arguments
+    /// * `name` - Source name used in log messages
+    /// * `failure_threshold` - Consecutive failures before the circuit opens
+    /// * `cooldown_secs` - How long the circuit stays open
+    pub fn new(name: &'static str, failure_threshold: u32, cooldown_secs: u64) -> Self {
+        Self {
+            name,
+            failure_threshold,
+            cooldown: Duration::from_secs(cooldown_secs),
+            state: std::sync::Mutex::new(BreakerState::default()),
+        }
+    }
+
+    fn state(&self) -> std::sync::MutexGuard<'_, BreakerState> {
+        self.state.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
+    /// Check whether a request may go ahead, claiming the probe if half-open
+    ///
+    /// Callers that get `true` must `record` the outcome. The probe holds the
+    /// circuit open for another cooldown, so if it never reports back (e.g.
+    /// its future is dropped) a new probe is admitted after that.
+    pub fn allow_request(&self) -> bool {
+        let mut state = self.state();
+        match state.open_until {
+            None => true,
+            Some(until) if Instant::now() < until => false,
+            Some(_) => {
+                debug!("{} cooldown over; letting one probe request through", self.name);
+                state.open_until = Some(Instant::now() + self.cooldown);
+                true
+            }
+        }
+    }
+
+    /// Record the outcome of a request; only transient errors count as failures
+    pub fn record<T>(&self, result: &Result<T, String>) {
+        let mut state = self.state();
+        match result {
+            Err(e) if is_transient_error(e) => {
+                state.consecutive_failures += 1;
+                if state.consecutive_failures >= self.failure_threshold {
+                    warn!(
+                        "{} failed {} times in a row; skipping it for {:?}",
+                        self.name, state.consecutive_failures, self.cooldown
+                    );
+                    state.open_until = Some(Instant::now() + self.cooldown);
+                }
+            }
+            _ => {
+                state.consecutive_failures = 0;
+                state.open_until = None;
+            }
+        }
+    }
+}
+
 /// Validate that bytes represent a PDF file
 ///
 /// # Arguments
@@ -262,10 +443,29 @@ pub mod rate_limiters {
     /// Semantic Scholar: 100 requests per 5 minutes (without API key)
     pub static SEMANTIC_SCHOLAR: Lazy<RateLimiter> = Lazy::new(|| RateLimiter::new(300, 100));
 
+    /// OpenAlex: polite pool allows 10 requests per second
+    pub static OPENALEX: Lazy<RateLimiter> = Lazy::new(|| RateLimiter::new(1, 10));
+
     /// arXiv: Be conservative, 1 request per 3 seconds
     pub static ARXIV: Lazy<RateLimiter> = Lazy::new(|| RateLimiter::new(3, 1));
 }
 
+/// Circuit breakers for the PDF lookup sources: 5 consecutive failures skip a
+/// source for a minute
+pub mod circuit_breakers {
+    use super::CircuitBreaker;
+    use once_cell::sync::Lazy;
+
+    pub static UNPAYWALL: Lazy<CircuitBreaker> = Lazy::new(|| CircuitBreaker::new("Unpaywall", 5, 60));
+
+    pub static SEMANTIC_SCHOLAR: Lazy<CircuitBreaker> =
+        Lazy::new(|| CircuitBreaker::new("Semantic Scholar", 5, 60));
+
+    pub static OPENALEX: Lazy<CircuitBreaker> = Lazy::new(|| CircuitBreaker::new("OpenAlex", 5, 60));
+
+    pub static ARXIV: Lazy<CircuitBreaker> = Lazy::new(|| CircuitBreaker::new("arXiv", 5, 60));
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -297,6 +497,70 @@ mod tests {
         assert_eq!(config.backoff_for_attempt(2), Duration::from_millis(2000));
     }
 
+    #[test]
+    fn test_retry_after_from_error() {
+        assert_eq!(
+            retry_after_from_error("status: 429 Too Many Requests (retry after 7s)"),
+            Some(Duration::from_secs(7))
+        );
+        assert_eq!(retry_after_from_error("status: 503 Service Unavailable"), None);
+    }
+
+    #[test]
+    fn test_with_jitter_bounds() {
+        let backoff = Duration::from_millis(1000);
+        for _ in 0..100 {
+            let jittered = with_jitter(backoff);
+            assert!(jittered >= Duration::from_millis(500) && jittered <= backoff);
+        }
+    }
+
+    #[test]
+    fn test_circuit_breaker() {
+        let breaker = CircuitBreaker::new("test", 2, 60);
+        let transient: Result<(), String> = Err("request failed: timed out".to_string());
+        let not_found: Result<(), String> = Err("status: 404 Not Found".to_string());
+
+        // A 404 is an answer, not an outage
+        breaker.record(&transient);
+        breaker.record(&not_found);
+        breaker.record(&transient);
+        assert!(breaker.allow_request());
+
+        // Two transient failures in a row open the circuit
+        breaker.record(&transient);
+        assert!(!breaker.allow_request());
+
+        // A success closes it again
+        breaker.record(&Ok::<(), String>(()));
+        assert!(breaker.allow_request());
+    }
+
+    #[test]
+    fn test_circuit_breaker_half_open_admits_one_probe() {
+        let breaker = CircuitBreaker::new("test", 1, 60);
+        let transient: Result<(), String> = Err("status: 503 Service Unavailable".to_string());
+
+        breaker.record(&transient);
+        assert!(!breaker.allow_request());
+
+        // Cooldown over: exactly one caller gets through
+        breaker.state().open_until = Some(Instant::now() - Duration::from_secs(1));
+        assert!(breaker.allow_request());
+        assert!(!breaker.allow_request());
+
+        // A failed probe reopens the circuit
+        breaker.record(&transient);
+        assert!(!breaker.allow_request());
+
+        // A successful probe closes it for everyone
+        breaker.state().open_until = Some(Instant::now() - Duration::from_secs(1));
+        assert!(breaker.allow_request());
+        breaker.record(&Ok::<(), String>(()));
+        assert!(breaker.allow_request());
+        assert!(breaker.allow_request());
+    }
+
     #[tokio::test]
     async fn test_rate_limiter() {
         let limiter = RateLimiter::new(1, 2);
@@ -1,3 +1,4 @@
 pub mod claude;
 pub mod http;
 pub mod keychain;
+pub mod text;
@@ -0,0 +1,162 @@
+//! Text normalization helpers
+//!
+//! Used to compare paper titles and author names when matching papers
+//! against the vault, and to tidy text extracted from PDFs.
+
+/// Normalize a title for comparison
+///
+/// Lowercases, drops everything except alphanumerics and whitespace, and
+/// collapses runs of whitespace to a single space. Done in one pass with a
+/// single allocation, since this runs once per vault paper when matching.
+pub fn normalize_title(title: &str) -> String {
+    let mut normalized = String::with_capacity(title.len());
+    let mut pending_space = false;
+
+    for c in title.chars().flat_map(char::to_lowercase) {
+        if c.is_alphanumeric() {
+            if pending_space && !normalized.is_empty() {
+                normalized.push(' ');
+            }
+            pending_space = false;
+            normalized.push(c);
+        } else if c.is_whitespace() {
+            pending_space = true;
+        }
+    }
+
+    normalized
+}
+
+/// Normalize an author name to a lowercase last name
+///
+/// Handles both "Firstname Lastname" and "Lastname, Firstname".
+pub fn normalize_author(author: &str) -> String {
+    let name = if author.contains(',') {
+        author.split(',').next().unwrap_or(author).trim()
+    } else {
+        author.split_whitespace().last().unwrap_or(author)
+    };
+    name.chars()
+        .flat_map(char::to_lowercase)
+        .filter(|c| c.is_alphanumeric())
+        .collect()
+}
+
+/// Join the non-blank lines of `text` with newlines, stopping at `max_len` bytes
+///
+/// Builds the result in one pass and stops reading once the budget is used,
+/// rather than collecting every line and copying a truncated prefix. If the
+/// budget runs out in its last tenth, the result ends on a whole line;
+/// otherwise the last line is cut with [`truncate_at_boundary`].
+pub fn join_nonblank_lines(text: &str, max_len: usize) -> String {
+    let mut joined = String::with_capacity(text.len().min(max_len));
+
+    for line in text.lines().filter(|line| !line.trim().is_empty()) {
+        let separator = if joined.is_empty() { "" } else { "\n" };
+        let room = max_len.saturating_sub(joined.len() + separator.len());
+
+        if line.len() > room {
+            let tail = if room > max_len / 10 {
+                truncate_at_boundary(line, room)
+            } else {
+                ""
+            };
+            if !tail.is_empty() {
+                joined.push_str(separator);
+                joined.push_str(tail);
+            }
+            break;
+        }
+
+        joined.push_str(separator);
+        joined.push_str(line);
+    }
+
+    joined
+}
+
+/// Longest prefix of `text` within `max_len` bytes, cut at a natural break
+///
+/// Prefers the last line break, then the last whitespace, in the final tenth
+/// of the budget, so a truncated prompt doesn't end mid-word (which tends to
+/// confuse the model); otherwise cuts at the last character boundary.
+pub fn truncate_at_boundary(text: &str, max_len: usize) -> &str {
+    if text.len() <= max_len {
+        return text;
+    }
+
+    let mut end = max_len;
+    while !text.is_char_boundary(end) {
+        end -= 1;
+    }
+
+    // ASCII bytes never occur inside a multi-byte character, so any match
+    // found here is a valid cut point
+    let window_start = (max_len - max_len / 10).min(end);
+    let window = &text.as_bytes()[window_start..end];
+    let cut = window
+        .iter()
+        .rposition(|&b| b == b'\n')
+        .or_else(|| window.iter().rposition(|b| b.is_ascii_whitespace()))
+        .map_or(end, |i| window_start + i);
+
+    &text[..cut]
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_normalize_title() {
+        assert_eq!(
+            normalize_title("  Learning to Rank:   A Survey! "),
+            "learning to rank a survey"
+        );
+        assert_eq!(normalize_title("Über-Modelle\tund\nMärkte"), "übermodelle und märkte");
+        assert_eq!(normalize_title("?!"), "");
+    }
+
+    #[test]
+    fn test_normalize_author() {
+        assert_eq!(normalize_author("Smith, John"), "smith");
+        assert_eq!(normalize_author("John O'Neil"), "oneil");
+        assert_eq!(normalize_author(""), "");
+    }
+
+    #[test]
+    fn test_join_nonblank_lines() {
+        let text = "Title\n\n   \nAbstract text\r\nBody\n";
+        assert_eq!(join_nonblank_lines(text, 1000), "Title\nAbstract text\nBody");
+        assert_eq!(join_nonblank_lines(text, 9), "Title\nAbs");
+        assert_eq!(join_nonblank_lines(text, 6), "Title");
+        assert_eq!(join_nonblank_lines("", 10), "");
+    }
+
+    #[test]
+    fn test_join_nonblank_lines_respects_char_boundaries() {
+        // "é" is two bytes; a 2-byte budget can't include half of it
+        assert_eq!(join_nonblank_lines("aé", 2), "a");
+        assert_eq!(join_nonblank_lines("aé", 3), "aé");
+    }
+
+    #[test]
+    fn test_truncate_at_boundary() {
+        let a = "a".repeat(90);
+        assert_eq!(truncate_at_boundary("short", 10), "short");
+        // A break in the last tenth of the budget is preferred, lines first
+        let text = format!("{}\nbb cc dd ee ff", a);
+        assert_eq!(truncate_at_boundary(&text, 100), a);
+        let text = format!("{}bb cc dd ee ff", a);
+        assert_eq!(truncate_at_boundary(&text, 100), format!("{}bb cc dd", a));
+        // No break in the last tenth: plain cut
+        assert_eq!(truncate_at_boundary(&"a".repeat(200), 100), "a".repeat(100));
+        assert_eq!(truncate_at_boundary("aé", 2), "a");
+    }
+
+    #[test]
+    fn test_join_nonblank_lines_ends_on_whole_line_near_budget() {
+        let text = format!("{}\n{}", "a".repeat(95), "b".repeat(20));
+        assert_eq!(join_nonblank_lines(&text, 100), "a".repeat(95));
+    }
+}